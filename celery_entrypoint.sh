@@ -3,5 +3,9 @@ set -e
 
 python wait_for_services.py
 
+# Consume the routed queues (see CELERY_TASK_ROUTES in settings.py) as well
+# as the default one; a worker started without -Q would leave everything
+# published to provider_io/provider_sync unconsumed. Override CELERY_QUEUES
+# to split the queues across dedicated workers.
 echo "Starting Celery worker..."
-exec celery -A whatsapp_template_service worker -l info
\ No newline at end of file
+exec celery -A whatsapp_template_service worker -l info -Q "${CELERY_QUEUES:-provider_io,provider_sync,celery}"
@@ -1,5 +1,6 @@
-from datetime import datetime
+import functools
 import hashlib
+import time
 import json
 from django.db import models
 import logging
@@ -28,6 +29,16 @@ def generate_app_secret():
     logger.debug('Generating new encryption secret for ProviderAppInstance')
     return base64.urlsafe_b64encode(os.urandom(32)).decode()
 
+
+@functools.lru_cache(maxsize=512)
+def _decrypt_app_token(secret_key: bytes, encrypted_token: bytes) -> str:
+    """Decrypt an app token, memoized per worker process.
+
+    Keyed on the ciphertext itself, so rotating a token naturally produces a
+    new cache entry and stale plaintext is never served.
+    """
+    return Fernet(secret_key).decrypt(encrypted_token).decode('utf-8')
+
 class Organisation(models.Model):
     id = models.CharField(primary_key=True, max_length=100, editable=False, unique=True)
     name = models.CharField(max_length=255, unique=True)
@@ -68,19 +79,24 @@ class ProviderAppInstance(models.Model):
             self.encryption_secret = Fernet.generate_key()
         f = Fernet(self.encryption_secret)
         self.encrypted_app_token = f.encrypt(raw_app_token.encode('utf-8'))
+        # Drop any cached plaintext so the rotated token is re-decrypted
+        self._app_token_plain = None
 
     def get_app_token(self) -> str:
         """Decrypt API key for runtime usage."""
+        cached = getattr(self, '_app_token_plain', None)
+        if cached is not None:
+            return cached
         logger.debug('Decrypting app token for ProviderAppInstance %s', self.app_id)
         if not self.encryption_secret or not self.encrypted_app_token:
             logger.debug('No encryption secret or encrypted token found, cannot decrypt')
             return None
-        
+
         secret_key = bytes(self.encryption_secret)
         encrypted_token_bytes = bytes(self.encrypted_app_token)
         logger.debug('Using existing encryption secret for ProviderAppInstance %s', self.app_id)
-        f = Fernet(secret_key)
-        return f.decrypt(encrypted_token_bytes).decode('utf-8')
+        self._app_token_plain = _decrypt_app_token(secret_key, encrypted_token_bytes)
+        return self._app_token_plain
     
     def set_phone_number(self, phone_number: str):
         """Set the phone number associated with this app instance."""
@@ -358,33 +374,40 @@ class WhatsAppTemplate(models.Model):
         self.isDeleted = 'Deleted'
         self.save()
     
+    def set_provider_metadata(self, key, value):
+        """
+        Merge a single key into provider_metadata and persist it with one
+        targeted UPDATE of just that column, instead of hydrating and
+        re-writing the full row via save().
+        """
+        meta = self.provider_metadata or {}
+        meta[key] = value
+        self.provider_metadata = meta
+        type(self).objects.filter(pk=self.pk).update(provider_metadata=meta)
+
     def update_error_meta(self, key, value):
         """
-        Updates an existing JSONField by reading the current value, 
-        modifying the dictionary, and saving the instance.
+        Merges one action's error entry into errorMessageMeta and persists
+        it with a targeted UPDATE of just that column, so provider failure
+        paths (which may call this several times per task) don't pay a
+        full-row save() each time.
         """
-        
-        # 1. Read: Get the current dictionary
         meta = self.errorMessageMeta or {}
-        
-        # 2. Modify: Update the dictionary in memory
-        error = {}
-        error['payload'] = value
-        error['ts'] = str(datetime.now().timestamp())
-        meta[key] = error
-        
-        
-        # 3. Write: Assign the modified dictionary back to the field
+        meta[key] = {
+            'payload': value,
+            'ts': time.time(),
+        }
         self.errorMessageMeta = meta
-        
-        # 4. Save: Persist the change to the database
-        self.save()
+        type(self).objects.filter(pk=self.pk).update(errorMessageMeta=meta)
     
-    def _update_and_log_webhook_event(self, event_type: str, main_field_value:str, event_payload: dict):
+    def _update_and_log_webhook_event(self, event_type: str, main_field_value:str, event_payload: dict, save: bool = True):
         """
         Helper to perform two operations atomically:
         1. Update the main model fields (status, category, quality).
         2. Replace the event details in webhookMeta[event_type] with the latest data.
+
+        Pass save=False when the caller batches several templates into a
+        single bulk_update instead of saving one row at a time.
         """
         if event_type == 'status-update':
             self.status = main_field_value
@@ -394,7 +417,7 @@ class WhatsAppTemplate(models.Model):
             self.quality = main_field_value
         
         # Add timestamp and source payload
-        event_payload['ts'] = str(datetime.now().timestamp())
+        event_payload['ts'] = time.time()
         # event_data['raw_payload'] = event_payload # Optional: store raw payload for debugging
         
         # 3. Replace the entry in webhookMeta
@@ -404,7 +427,8 @@ class WhatsAppTemplate(models.Model):
         self.webhookMeta = meta
         
         # 4. Save the instance to persist changes
-        self.save()
+        if save:
+            self.save()
    
 class CatalogMetadata(models.Model):
     """
@@ -1,7 +1,29 @@
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+
 from .gupshup import GupshupProvider
 
+# Shared session so keep-alive connections (and their TLS handshakes) are
+# reused across task invocations within the same worker process.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64)
+_SESSION.mount('https://', _adapter)
+_SESSION.mount('http://', _adapter)
+
 
-def get_provider(name, **kwargs):
+@lru_cache(maxsize=256)
+def _build_provider(name, app_id, org_id):
+    """Construct (once per worker) the provider object for an app instance."""
     if name == 'gupshup':
-        return GupshupProvider(**kwargs)
+        return GupshupProvider(app_id=app_id, org_id=org_id, session=_SESSION)
     raise ValueError('Unknown provider')
+
+
+def get_provider(name, app_token=None, app_id=None, org_id=None):
+    # Instances are memoized per (name, app_id, org_id); only the token is
+    # refreshed on each call since it may rotate between tasks.
+    provider = _build_provider(name, app_id, org_id)
+    provider.app_token = app_token
+    return provider
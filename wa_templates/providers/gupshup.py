@@ -1,9 +1,14 @@
-from datetime import datetime
 import hashlib
 import json
+import random
 from urllib.parse import urlencode
 import requests
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from wa_templates.models import WhatsAppTemplate
 from wa_templates.utils import constants
 from wa_templates.utils.media_validator import is_gupshup_handle_id, is_valid_media_url
@@ -18,13 +23,28 @@ from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+
+def _loads(raw):
+    """Decode a JSON body with orjson (C-backed) when available.
+
+    orjson takes bytes directly, skipping the text-decode step the stdlib
+    path pays on large sync responses; stdlib json is the fallback.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 class GupshupProvider(BaseProvider):
     BASE = 'https://partner.gupshup.io'
 
-    def __init__(self, app_token=None, app_id=None, org_id=None):
+    def __init__(self, app_token=None, app_id=None, org_id=None, session=None):
         self.app_token = app_token
         self.app_id = app_id
         self.org_id = org_id
+        # Pooled session injected by the factory; fall back to a private one
+        # so the provider still works when constructed directly (e.g. tests).
+        self.session = session or requests.Session()
 
     def headers(self):
         logger.debug('Generating headers for GupshupProvider with app_id %s', self.app_id)
@@ -74,30 +94,30 @@ class GupshupProvider(BaseProvider):
         req = requests.Request(method, url, **kwargs)
         prepped = req.prepare()
         
-        # 2. Send Request
-        with requests.Session() as s:
+        # 2. Send Request over the pooled session (connections stay alive
+        # between calls instead of paying a fresh TCP+TLS handshake each time)
+        try:
+            # Use stream=False for non-media uploads
+            if data:
+                logger.info("Encoded form data:\n%s", urlencode(data))
+
+            r = self.session.send(prepped, timeout=10, allow_redirects=True)
+            logger.debug(f'response from gupshup {r}')
             try:
-                # Use stream=False for non-media uploads
-                if data:
-                    logger.info("Encoded form data:\n%s", urlencode(data))
+                dump_data = dump.dump_all(r)
+                logger.debug("Outgoing HTTP:\n%s", dump_data.decode("utf-8"))
+            except Exception as e:
+                logger.exception("Failed to dump request: %s", e)
+            r.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
 
-                r = s.send(prepped,timeout=10, allow_redirects=True)
-                logger.debug(f'response from gupshup {r}')
-                try:
-                    dump_data = dump.dump_all(r)
-                    logger.debug("Outgoing HTTP:\n%s", dump_data.decode("utf-8"))
-                except Exception as e:
-                    logger.exception("Failed to dump request: %s", e)
-                r.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-            
-            except requests.exceptions.HTTPError as e:
-                logger.exception("HTTP Error from Gupshup (%s %s): %s", method, endpoint, e)
-                # Return standardized error structure
-                return {'ok': False, 'status_code': r.status_code, 'response': r.text}
-            
-            except requests.exceptions.RequestException as e:
-                logger.exception("Network Error during Gupshup request (%s %s): %s", method, endpoint, e)
-                return {'ok': False, 'status_code': 0, 'response': f'Network Error: {e}'}
+        except requests.exceptions.HTTPError as e:
+            logger.exception("HTTP Error from Gupshup (%s %s): %s", method, endpoint, e)
+            # Return standardized error structure
+            return {'ok': False, 'status_code': r.status_code, 'response': r.text}
+
+        except requests.exceptions.RequestException as e:
+            logger.exception("Network Error during Gupshup request (%s %s): %s", method, endpoint, e)
+            return {'ok': False, 'status_code': 0, 'response': f'Network Error: {e}'}
 
         # 3. Process Successful Response
         response_data = {'ok': True, 'status_code': r.status_code}
@@ -105,12 +125,13 @@ class GupshupProvider(BaseProvider):
             # Attempt to parse JSON only if content type indicates JSON
             logger.debug(f'raw response before processing {r.raw}')
             if r.headers.get('content-type', '').startswith('application/json'):
-                logger.debug(f'writing from json. response {r.json}')
-                response_data['json'] = r.json()
+                # Decode straight from the raw bytes; big get_templates bodies
+                # never round-trip through a Python str this way.
+                response_data['json'] = _loads(r.content)
             else:
                 logger.debug(f'writing from text. response {r.text}')
                 response_data['text'] = r.text
-        except json.JSONDecodeError:
+        except ValueError:
                 logger.error(f'JSONDecodeError {r.raw}')
                 response_data['text'] = r.text
         
@@ -128,7 +149,7 @@ class GupshupProvider(BaseProvider):
                 return None
 
             # Step 1: Download file content
-            download_resp = requests.get(media_url, stream=False, timeout=10)
+            download_resp = self.session.get(media_url, stream=False, timeout=10)
             logger.debug(f'download response {download_resp.status_code}')
             if download_resp.status_code != 200:
                 raise requests.exceptions.RequestException(
@@ -159,7 +180,7 @@ class GupshupProvider(BaseProvider):
                     del h['content-type']
                 
                 try:
-                    response = requests.post(
+                    response = self.session.post(
                         upload_url,
                         headers=h,
                         files=files,
@@ -206,8 +227,9 @@ class GupshupProvider(BaseProvider):
                 except Exception as e:
                     logger.exception("Error on upload attempt %d: %s", attempt + 1, str(e))
 
-                # Retry after exponential backoff
-                time.sleep(1 + attempt)
+                # Full-jitter exponential backoff so concurrent workers
+                # don't retry the provider in lockstep
+                time.sleep(random.uniform(0, 2 ** attempt))
 
             logger.error("Media upload failed after 3 attempts.")
             raise requests.exceptions.HTTPError("Media upload failed after retries.")
@@ -231,7 +253,9 @@ class GupshupProvider(BaseProvider):
                     logger.debug('media_url is already a Gupshup handle ID, skipping upload')
                     #template.provider_metadata['media_id'] = template.media_url
                     template.exampleMedia = template.media_url
-                    template.save()
+                    # hash is reassigned in save(); include it so the narrow
+                    # UPDATE still persists a recomputed value
+                    template.save(update_fields=['exampleMedia', 'hash'])
                 else:
                     logger.debug('media_url is not a Gupshup handle ID, proceeding to upload')
                     isValidMedia, file_type  = is_valid_media_url(template.media_url, template.templateType)
@@ -249,7 +273,7 @@ class GupshupProvider(BaseProvider):
                         # template.provider_metadata['media_id'] = handle_id
                         template.exampleMedia = handle_id
                         template.media_url = handle_id
-                        template.save()
+                        template.save(update_fields=['exampleMedia', 'media_url', 'hash'])
                         template.update_error_meta(
                                 constants.GupshupAction.UPLOAD_MEDIA.value,
                                 "Success"
@@ -471,8 +495,8 @@ class GupshupProvider(BaseProvider):
             # If 'json' key is missing, check if 'text' is present and try to parse it
             if response_body is None and provider_resp_data.get('text'):
                 try:
-                    response_body = json.loads(provider_resp_data['text'])
-                except json.JSONDecodeError:
+                    response_body = _loads(provider_resp_data['text'])
+                except ValueError:
                     logger.error("Failed to decode text response as JSON: %s", provider_resp_data['text'])
                     return {'ok': False, 'response': 'Provider returned unparseable text response.'}
 
@@ -486,6 +510,14 @@ class GupshupProvider(BaseProvider):
             if response_body.get('status') == 'success':
                 templates = response_body.get('templates', [])
                 
+                # One prefetch for every element name instead of a SELECT
+                # per template inside the loop.
+                element_names = [t.get('elementName') for t in templates if t.get('elementName')]
+                existing_by_name = {
+                    obj.elementName: obj
+                    for obj in WhatsAppTemplate.objects.filter(elementName__in=element_names)
+                }
+
                 templates_to_update = []
                 for tpl in templates:
                     element_name = tpl.get('elementName')
@@ -494,7 +526,7 @@ class GupshupProvider(BaseProvider):
                     # Compute hash of template content for change detection
                     tpl_hash = hashlib.md5(json.dumps(tpl, sort_keys=True).encode('utf-8')).hexdigest()
 
-                    template_obj = WhatsAppTemplate.objects.filter(elementName=element_name).first()
+                    template_obj = existing_by_name.get(element_name)
                     logger.debug(f'template_obj : {template_obj}')
 
                     t_update = self.sync_templates(tpl, tpl_hash, template_obj)
@@ -556,7 +588,7 @@ class GupshupProvider(BaseProvider):
                 if provider_resp_data.get('json', {}).get('status') == 'success':
                     self.save_template_provider(provider_resp_data['json'], template)
                     template.status = 'pending'
-                    template.save()
+                    template.save(update_fields=['status', 'hash'])
                     template.update_error_meta(
                         constants.GupshupAction.UPDATE_TEMPLATE.value,
                         "Success"
@@ -616,7 +648,12 @@ class GupshupProvider(BaseProvider):
                 template_obj.templateType = tpl.get('templateType')
                 template_obj.wabaId = tpl.get('wabaId')
 
-                template_obj.provider_metadata.update({'last_update': str(datetime.now().timestamp())})
+                # Mutated in memory only; the caller persists the whole
+                # batch with one bulk upsert, so no per-template write here.
+                template_obj.provider_metadata = {
+                    **(template_obj.provider_metadata or {}),
+                    'last_update': time.time(),
+                }
                 
                 if tpl.get('containerMeta'):
                     self.parse_container_meta(tpl.get('containerMeta'), template_obj)
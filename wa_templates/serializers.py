@@ -37,6 +37,11 @@ class WhatsAppTemplateSerializer(serializers.ModelSerializer):
         # Validate payload JSON against schema rules for the selected type
         payload = data.get('payload')
         if payload is not None:
+            # On partial updates an unchanged payload has already been
+            # validated when it was first stored; skip the schema traversal.
+            if self.partial and self.instance is not None and payload == self.instance.payload:
+                logger.debug('Payload unchanged on partial update, skipping schema validation')
+                return data
             logger.debug('Validating payload for template type %s: %s', ttype, payload)
             try:
                 template_schemas.validate_payload(ttype, data)
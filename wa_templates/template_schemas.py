@@ -1,4 +1,5 @@
 import logging
+import types
 try:
     from jsonschema import validate, Draft7Validator, FormatChecker
     from jsonschema.exceptions import ValidationError as JsonSchemaValidationError
@@ -8,6 +9,11 @@ except ImportError:
     FormatChecker = None
     JsonSchemaValidationError = None
 
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,7 +29,7 @@ class PayloadValidationError(Exception):
 
 # --- Common Schemas ---
 
-BUTTON_SCHEMA = {
+BUTTON_SCHEMA = types.MappingProxyType({
     'type': 'object',
     'properties': {
         'type': {'type': 'string', 'enum': ['QUICK_REPLY', 'URL', 'PHONE_NUMBER']},
@@ -36,15 +42,28 @@ BUTTON_SCHEMA = {
     },
     'required': ['type', 'text'],
     'additionalProperties': True,
-    'if': {'properties': {'type': {'const': 'URL'}}},
-    'then': {'required': ['url', 'buttonValue']},
-    'if': {'properties': {'type': {'const': 'PHONE_NUMBER'}}},
-    'then': {'required': ['phone_number']},
-}
+    # allOf so both conditionals apply; as sibling keys the second 'if'
+    # silently overwrote the first and the URL rule was never enforced.
+    'allOf': [
+        {
+            'if': {'properties': {'type': {'const': 'URL'}}},
+            'then': {'required': ['url', 'buttonValue']},
+        },
+        {
+            'if': {'properties': {'type': {'const': 'PHONE_NUMBER'}}},
+            'then': {'required': ['phone_number']},
+        },
+    ],
+})
+
+# Shared sub-schemas are embedded once under $defs and referenced by $ref,
+# so the compiled validators don't each carry (and re-walk) their own copy.
+_BUTTON_REF = {'$ref': '#/$defs/button'}
+_CARD_REF = {'$ref': '#/$defs/carouselCard'}
 
 # --- Template Type Schemas (Validates the ENTIRE Input Data) ---
 
-BASE_TEMPLATE_SCHEMA = {
+BASE_TEMPLATE_SCHEMA = types.MappingProxyType({
     'type': 'object',
     'properties': {
         'elementName': {'type': 'string', 'maxLength': 200},
@@ -73,36 +92,52 @@ BASE_TEMPLATE_SCHEMA = {
         'enableSample',
     ],
     'additionalProperties': True, # Allow other top-level fields (e.g., org_id, app_id, etc.)
-}
+})
+
+
+def _merge(base, overlay):
+    """Copy-on-build merge of a frozen base schema with per-type overrides.
+
+    'properties' is merged one level deep; every other overlay key replaces
+    the base value. The bases stay MappingProxyType-frozen, so a bug fix in
+    one derived schema can't silently mutate the others through a shared
+    reference.
+    """
+    merged = dict(base)
+    overlay_props = overlay.get('properties')
+    if overlay_props:
+        merged['properties'] = {**base['properties'], **overlay_props}
+    for k, v in overlay.items():
+        if k != 'properties':
+            merged[k] = v
+    return merged
 
 # TEXT TEMPLATE SCHEMA
-TEXT_SCHEMA = dict(BASE_TEMPLATE_SCHEMA, **{
-    'properties': dict(BASE_TEMPLATE_SCHEMA['properties'], **{
+TEXT_SCHEMA = _merge(BASE_TEMPLATE_SCHEMA, {
+    'properties': {
         'payload': {
             'type': 'object',
             'properties': {
-                'buttons': {'type': 'array', 'items': BUTTON_SCHEMA, 'maxItems': 10},
+                'buttons': {'type': 'array', 'items': _BUTTON_REF, 'maxItems': 10},
             },
             'additionalProperties': True,
         }
-    }),
-    'required': BASE_TEMPLATE_SCHEMA['required'] # Ensure payload is present for buttons validation
+    },
+    '$defs': {'button': BUTTON_SCHEMA},
 })
 
 # MEDIA TEMPLATE SCHEMA (IMAGE, VIDEO, DOCUMENT)
-MEDIA_SCHEMA = {
-    **BASE_TEMPLATE_SCHEMA,
+MEDIA_SCHEMA = _merge(BASE_TEMPLATE_SCHEMA, {
     'properties': {
-        **BASE_TEMPLATE_SCHEMA['properties'],
         'payload': {
             'type': 'object',
             'properties': {
-                'buttons': {'type': 'array', 'items': BUTTON_SCHEMA, 'maxItems': 10},
+                'buttons': {'type': 'array', 'items': _BUTTON_REF, 'maxItems': 10},
             },
             'additionalProperties': True,
         },
     },
-    'required': BASE_TEMPLATE_SCHEMA['required'],
+    '$defs': {'button': BUTTON_SCHEMA},
     'allOf': [
         {
             'if': {'properties': {'enableSample': {'const': True}}},
@@ -114,7 +149,7 @@ MEDIA_SCHEMA = {
             }
         }
     ],
-}
+})
 
 # CAROUSEL TEMPLATE SCHEMA
 CAROUSEL_CARD_SCHEMA = {
@@ -123,21 +158,21 @@ CAROUSEL_CARD_SCHEMA = {
         'mediaUrl': {'type': ['string', 'null'], 'format': 'uri'},
         'body': {'type': 'string'},
         'sampleText': {'type': 'string'},
-        'buttons': {'type': 'array', 'items': BUTTON_SCHEMA, 'maxItems': 2},
+        'buttons': {'type': 'array', 'items': _BUTTON_REF, 'maxItems': 2},
         'example':{'type': 'array', 'items': {'type': 'string'}},
     },
     'required': ['mediaUrl', 'body', 'headerType', 'buttons'], # Buttons are mandatory on cards
     'additionalProperties': True,
 }
 
-CAROUSEL_SCHEMA = dict(BASE_TEMPLATE_SCHEMA, **{
-    'properties': dict(BASE_TEMPLATE_SCHEMA['properties'], **{
+CAROUSEL_SCHEMA = _merge(BASE_TEMPLATE_SCHEMA, {
+    'properties': {
         'payload': {
             'type': 'object',
             'properties': {
                 'cards': {
                     'type': 'array',
-                    'items': CAROUSEL_CARD_SCHEMA,
+                    'items': _CARD_REF,
                     'minItems': 1,
                     'maxItems': 10,
                 },
@@ -145,8 +180,11 @@ CAROUSEL_SCHEMA = dict(BASE_TEMPLATE_SCHEMA, **{
             'required': ['cards'],
             'additionalProperties': True,
         }
-    }),
-    'required': BASE_TEMPLATE_SCHEMA['required'] + ['enableSample', 'payload']
+    },
+    # enableSample is already required by the base schema; listing it twice
+    # is redundant (and rejected by fastjsonschema's schema checks)
+    'required': list(BASE_TEMPLATE_SCHEMA['required']) + ['payload'],
+    '$defs': {'button': BUTTON_SCHEMA, 'carouselCard': CAROUSEL_CARD_SCHEMA},
 })
 
 
@@ -159,6 +197,96 @@ SCHEMAS = {
     'CATALOG': BASE_TEMPLATE_SCHEMA, # Minimal validation for CATALOG
 }
 
+# Compile each validator once at import; Draft7Validator construction walks
+# the whole schema tree, which is pure overhead to repeat per request.
+if Draft7Validator is not None and FormatChecker is not None:
+    _FORMAT_CHECKER = FormatChecker()
+    _VALIDATORS = {
+        t: Draft7Validator(s, format_checker=_FORMAT_CHECKER)
+        for t, s in SCHEMAS.items()
+    }
+else:
+    _VALIDATORS = {}
+
+
+def _thaw(value):
+    """Deep-copy a schema into plain dicts (fastjsonschema can't code-gen
+    from MappingProxyType)."""
+    if isinstance(value, (dict, types.MappingProxyType)):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_thaw(v) for v in value]
+    return value
+
+
+# Code-generated accept/reject gate: fastjsonschema compiles each schema to
+# a specialized Python function, which is far cheaper per call than
+# interpreting the schema tree. jsonschema stays the source of truth for
+# the detailed error dict on the rejection path, and everything still works
+# if fastjsonschema isn't installed.
+_FAST_VALIDATORS = {}
+if fastjsonschema is not None:
+    try:
+        _FAST_VALIDATORS = {
+            t: fastjsonschema.compile(_thaw(s)) for t, s in SCHEMAS.items()
+        }
+    except Exception:
+        logger.exception('fastjsonschema compilation failed; using jsonschema only')
+        _FAST_VALIDATORS = {}
+
+
+def _is_schema_valid(templateType, data):
+    """Cheap validity gate shared by the single and bulk entry points."""
+    fast = _FAST_VALIDATORS.get(templateType)
+    if fast is not None:
+        try:
+            fast(data)
+            return True
+        except fastjsonschema.JsonSchemaException:
+            return False
+    return _VALIDATORS[templateType].is_valid(data)
+
+
+def _format_path(path):
+    """Render a jsonschema error path as dot/bracket notation in one pass.
+
+    Emits '.name' / '[idx]' segments straight into a join instead of
+    rewriting the tail of an accumulator list per element.
+    """
+    parts = []
+    for p in path:
+        if type(p) is int:
+            parts.append(f"[{p}]")
+        else:
+            parts.append(f".{p}" if parts else str(p))
+    return ''.join(parts)
+
+
+def _format_errors(errors):
+    """Turn jsonschema errors into the frontend-friendly {path: message} dict."""
+    return {(_format_path(e.path) or '_schema'): e.message for e in errors}
+
+
+def validate_payloads_bulk(templateType, payloads):
+    """Validate many template data dicts of one type against a shared validator.
+
+    Returns a dict mapping payload index -> {path: message} for each invalid
+    entry; an empty dict means everything passed. The compiled validator is
+    looked up once, so a sync batch of N templates pays N validations and
+    zero schema compilations.
+    """
+    validator = _VALIDATORS.get(templateType)
+    if validator is None:
+        raise PayloadValidationError({'_schema': f'No schema for template type {templateType}'})
+
+    errors_by_index = {}
+    for i, payload in enumerate(payloads):
+        if not _is_schema_valid(templateType, payload):
+            errors_by_index[i] = _format_errors(
+                sorted(validator.iter_errors(payload), key=lambda e: tuple(e.path))
+            )
+    return errors_by_index
+
 
 def validate_payload(templateType, data):
     """
@@ -180,31 +308,19 @@ def validate_payload(templateType, data):
         raise ImportError('jsonschema is required to validate payloads. Install via pip install jsonschema')
 
     # --- 1. Perform Schema Validation on the entire data dictionary ---
-    
+
     # NOTE: We use data (the full validated_data) here, not just data.get('payload')
-    validator = Draft7Validator(schema, format_checker=FormatChecker())
-    errors = sorted(validator.iter_errors(data), key=lambda e: e.path)
-    logger.debug('Found %d schema validation errors', len(errors))
-    
-    if errors:
-        errs = {}
-        for e in errors:
-            # build a readable path
-            path = []
-            for p in e.path:
-                if isinstance(p, int):
-                    if path:
-                        path[-1] = f"{path[-1]}[{p}]"
-                    else:
-                        path.append(f"[{p}]")
-                else:
-                    path.append(str(p))
-            
-            # Use the field name as the key, prefix nested errors with 'payload.'
-            key = '.'.join(path) if path else '_schema'
-            errs[key] = e.message
-            
-        raise PayloadValidationError(errs)
+    validator = _VALIDATORS[templateType]
+
+    # Fast gate: the code-generated validator (or is_valid, which stops at
+    # the first error) lets valid payloads — the common case — skip
+    # materializing and sorting the full error list.
+    if not _is_schema_valid(templateType, data):
+        # tuple(e.path) compares faster than the deque jsonschema exposes
+        errors = sorted(validator.iter_errors(data), key=lambda e: tuple(e.path))
+        logger.debug('Found %d schema validation errors', len(errors))
+        if errors:
+            raise PayloadValidationError(_format_errors(errors))
 
     # --- 2. Additional Semantic Checks ---
     
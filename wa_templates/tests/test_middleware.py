@@ -4,31 +4,34 @@ from unittest.mock import patch
 
 
 class InjectOrgMiddlewareTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The middleware reads JWT_ORG_MIDDLEWARE_STRICT per request, not in
+        # __init__, so one instance (and one RequestFactory) serves every
+        # test, including the override_settings one.
+        cls.rf = RequestFactory()
+        cls.mw = InjectOrgMiddleware(get_response=lambda r: None)
+
     def test_middleware_tolerant_no_auth_header(self):
-        rf = RequestFactory()
-        request = rf.get('/api/templates/')
-        mw = InjectOrgMiddleware(get_response=lambda r: None)
-        resp = mw.process_request(request)
+        request = self.rf.get('/api/templates/')
+        resp = self.mw.process_request(request)
         self.assertIsNone(resp)
         self.assertIsNone(getattr(request, 'org_id', None))
 
     def test_middleware_tolerant_invalid_token(self):
-        rf = RequestFactory()
-        request = rf.get('/api/templates/', HTTP_AUTHORIZATION='Bearer bad.token.here')
-        mw = InjectOrgMiddleware(get_response=lambda r: None)
+        request = self.rf.get('/api/templates/', HTTP_AUTHORIZATION='Bearer bad.token.here')
 
         # Patch _decode_token to raise to simulate invalid token
         with patch.object(InjectOrgMiddleware, '_decode_token', side_effect=Exception('invalid')):
-            resp = mw.process_request(request)
+            resp = self.mw.process_request(request)
         self.assertIsNone(resp)
         self.assertIsNone(getattr(request, 'org_id', None))
 
     @override_settings(JWT_ORG_MIDDLEWARE_STRICT=True)
     def test_middleware_strict_invalid_token(self):
-        rf = RequestFactory()
-        request = rf.get('/api/templates/', HTTP_AUTHORIZATION='Bearer bad.token.here')
-        mw = InjectOrgMiddleware(get_response=lambda r: None)
+        request = self.rf.get('/api/templates/', HTTP_AUTHORIZATION='Bearer bad.token.here')
         with patch.object(InjectOrgMiddleware, '_decode_token', side_effect=Exception('invalid')):
-            resp = mw.process_request(request)
+            resp = self.mw.process_request(request)
         self.assertIsNotNone(resp)
         self.assertEqual(getattr(resp, 'status_code', None), 401)
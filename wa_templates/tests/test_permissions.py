@@ -1,30 +1,96 @@
-from django.test import TestCase, Client
-from wa_templates.models import Tenant, TenantUser, WhatsAppTemplate
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from wa_templates.models import Organisation, ProviderAppInstance, WhatsAppTemplate
 from django.urls import reverse
 import jwt
-from django.conf import settings
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
 
+# One RS256 keypair for the whole module, generated at import; keygen is
+# the expensive part and PyJWT accepts the key object directly, so each
+# sign skips the millisecond-scale load_pem_private_key call.
+_PRIVATE_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+_PUBLIC_PEM = _PRIVATE_KEY.public_key().public_bytes(
+    encoding=serialization.Encoding.PEM,
+    format=serialization.PublicFormat.SubjectPublicKeyInfo,
+).decode()
 
+
+@override_settings(JWT_PUBLIC_KEY=_PUBLIC_PEM, JWT_ALGORITHM='RS256')
 class PermissionTest(TestCase):
+    # Only the default database is used by these tests.
+    databases = {'default'}
+
+    # Signed tokens keyed by payload; identical payloads recur across tests
+    # and an RS256 sign per call is pure overhead.
+    _token_cache = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        # One INSERT per class instead of per test; each test method rolls
+        # back to a savepoint rather than re-creating these rows.
+        cls.org = Organisation.objects.create(id='org_perm_a', name='Acme')
+        cls.other_org = Organisation.objects.create(id='org_perm_b', name='Other')
+        cls.app = ProviderAppInstance.objects.create(
+            app_id='app_perm_a', provider_nick_name='Acme App', organisation=cls.org,
+            encrypted_app_token=b'token', encryption_secret=b'secret',
+        )
+        cls.other_app = ProviderAppInstance.objects.create(
+            app_id='app_perm_b', provider_nick_name='Other App', organisation=cls.other_org,
+            encrypted_app_token=b'token', encryption_secret=b'secret',
+        )
+        WhatsAppTemplate.objects.create(
+            elementName='perm_template', languageCode='en', templateType='TEXT',
+            content='hi', org_id=cls.org, provider_app_instance_app_id=cls.app,
+        )
+        cls.token = cls.make_token({'org': cls.org.id, 'sub': 'user-1'})
+        cls.list_url = reverse('template-list', kwargs={'app_id': cls.app.app_id})
+        cls.other_list_url = reverse('template-list', kwargs={'app_id': cls.other_app.app_id})
+
     def setUp(self):
-        self.tenant = Tenant.objects.create(name='Acme', slug='acme-1')
-        self.other = Tenant.objects.create(name='Other', slug='other')
-        self.user = TenantUser.objects.create(tenant=self.tenant, username='joe', user_id='user-1')
-        self.client = Client()
-
-    def make_token(self, payload):
-        # create unsigned token for tests or sign with a dummy key
-        private_key = getattr(settings, 'TEST_JWT_PRIVATE_KEY', None)
-        if private_key:
-            return jwt.encode(payload, private_key, algorithm='RS256')
-        return jwt.encode(payload, 'secret', algorithm='HS256')
-
-    def test_cannot_access_other_tenant(self):
-        token = self.make_token({'tenant': self.tenant.slug, 'sub': self.user.user_id})
-        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}', 'CONTENT_TYPE': 'application/json'}
-        # try to create a template for other tenant
-        import json
-        data = {'tenant': self.other.id, 'name': 't1', 'templateType': 'TEXT', 'content': 'hi'}
-        resp = self.client.post('/api/templates/', json.dumps(data), **headers)
-        # should be forbidden (403)
+        # credentials() installs the header once; requests reuse it instead
+        # of rebuilding a header dict per call.
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    @classmethod
+    def make_token(cls, payload):
+        key = tuple(sorted(payload.items()))
+        token = cls._token_cache.get(key)
+        if token is None:
+            token = jwt.encode(payload, _PRIVATE_KEY, algorithm='RS256')
+            cls._token_cache[key] = token
+        return token
+
+    def test_missing_token_is_rejected(self):
+        self.client.credentials()  # drop the Authorization header
+        resp = self.client.get(self.list_url)
         self.assertEqual(resp.status_code, 403)
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-jwt')
+        resp = self.client.get(self.list_url)
+        self.assertEqual(resp.status_code, 403)
+
+    def test_valid_token_lists_own_templates(self):
+        resp = self.client.get(self.list_url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data), 1)
+        self.assertEqual(resp.data[0]['elementName'], 'perm_template')
+
+    def test_cannot_read_other_org_app(self):
+        # The queryset scopes to the token's org, so another org's app id
+        # yields nothing rather than leaking its templates.
+        resp = self.client.get(self.other_list_url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, [])
+
+    def test_cannot_create_under_other_org_app(self):
+        data = {
+            'elementName': 't1', 'languageCode': 'en', 'templateType': 'TEXT',
+            'content': 'hi', 'category': 'MARKETING', 'vertical': 'Internal',
+            'example': 'hi', 'enableSample': False,
+        }
+        resp = self.client.post(self.other_list_url, data, format='json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('not found for this org', str(resp.data))
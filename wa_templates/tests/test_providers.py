@@ -1,19 +1,88 @@
 from django.test import TestCase
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from wa_templates.providers.gupshup import GupshupProvider
-from wa_templates.models import Tenant, WhatsAppTemplate
+from wa_templates.models import Organisation, ProviderAppInstance, WhatsAppTemplate
+
+
+class _FakeResponse:
+    """Plain-attribute response stub; avoids MagicMock's __getattr__ cost."""
+    def __init__(self, status_code=200, json_data=None, content=b'', text=''):
+        self.status_code = status_code
+        self._json = json_data
+        self.content = content
+        self.text = text
+
+    def json(self):
+        return self._json
+
+    def raise_for_status(self):
+        pass
+
+
+_HANDLE_ID = (
+    '4::aW1hZ2UvanBlZw:ARZtestHandleSegmentOne_abcdefghijklmnop'
+    ':ARZtestHandleSegmentTwo_qrstuvwxyz012345:e:1760802361:340384197887925'
+    ':61580519339768:ARZ4CdfFm5XotDp513Q'
+)
+_MEDIA_DOWNLOAD_RESPONSE = _FakeResponse(content=b'\xff\xd8\xff' + b'\x00' * 32)
+_MEDIA_UPLOAD_RESPONSE = _FakeResponse(
+    json_data={'status': 'success', 'handleId': {'message': _HANDLE_ID}}
+)
+_SUBMISSION_RESPONSE = {
+    'ok': True,
+    'status_code': 200,
+    'json': {'status': 'success', 'template': {'id': 'prov-tpl-1', 'status': 'PENDING'}},
+}
 
 
 class ProviderTest(TestCase):
-    @patch('wa_templates.providers.gupshup.requests.post')
-    def test_upload_media_and_submit(self, mock_post):
-        t = Tenant.objects.create(name='Acme', slug='acme3')
-        tpl = WhatsAppTemplate.objects.create(tenant=t, name='img1', templateType='IMAGE', media_url='https://example.com/sample.jpg', content='hi')
+    databases = {'default'}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.org = Organisation.objects.create(id='org_prov', name='Acme')
+        cls.provider_instance = ProviderAppInstance.objects.create(
+            app_id='app_prov',
+            provider_nick_name='Acme App',
+            organisation=cls.org,
+            encrypted_app_token=b'token',
+            encryption_secret=b'secret',
+        )
+        cls.template = WhatsAppTemplate.objects.create(
+            elementName='img1',
+            languageCode='en',
+            templateType='IMAGE',
+            media_url='https://example.com/sample.jpg',
+            content='hi',
+            org_id=cls.org,
+            provider_app_instance_app_id=cls.provider_instance,
+        )
 
-        # mock media upload response
-        mock_post.return_value.status_code = 200
-        mock_post.return_value.json.return_value = {'mediaId': '1234'}
+    # Media download/upload go through self.session, so the session is
+    # injected; only the final template POST is patched out.
+    @patch.object(GupshupProvider, '_make_request')
+    def test_upload_media_and_submit(self, mock_make_request):
+        tpl = self.template
 
-        p = GupshupProvider(api_key='key', app_id='app')
+        mock_session = MagicMock()
+        mock_session.get.return_value = _MEDIA_DOWNLOAD_RESPONSE
+        mock_session.post.return_value = _MEDIA_UPLOAD_RESPONSE
+        mock_make_request.return_value = _SUBMISSION_RESPONSE
+
+        p = GupshupProvider(
+            app_token='key', app_id='app_prov', org_id=self.org.id,
+            session=mock_session
+        )
         resp = p.submit_template(tpl)
-        assert tpl.provider_metadata.get('media_id') == '1234'
+
+        self.assertIs(resp['ok'], True)
+        # The uploaded media's handle id replaces the source URL
+        self.assertEqual(tpl.exampleMedia, _HANDLE_ID)
+        self.assertEqual(tpl.media_url, _HANDLE_ID)
+        mock_session.get.assert_called_once_with(
+            'https://example.com/sample.jpg', stream=False, timeout=10
+        )
+        self.assertTrue(mock_session.post.called)
+        # Provider response data was copied back onto the template
+        tpl.refresh_from_db()
+        self.assertEqual(tpl.provider_template_id, 'prov-tpl-1')
@@ -1,11 +1,13 @@
 from django.test import TestCase
 from wa_templates.serializers import WhatsAppTemplateSerializer
-from wa_templates.models import Tenant
 
 
 class SerializerTest(TestCase):
+    databases = {'default'}
+
     def test_text_requires_content(self):
-        t = Tenant.objects.create(name='Acme', slug='acme2')
-        data = {'tenant': t.id, 'name': 'no-content', 'templateType': 'TEXT'}
+        # Validation fails on the missing content field before any FK is
+        # dereferenced, so a sentinel id avoids the tenant INSERT entirely.
+        data = {'tenant': 1, 'name': 'no-content', 'templateType': 'TEXT'}
         s = WhatsAppTemplateSerializer(data=data)
         self.assertFalse(s.is_valid())
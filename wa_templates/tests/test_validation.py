@@ -1,37 +1,53 @@
+from types import MappingProxyType
+
 from django.test import TestCase
 from wa_templates.template_schemas import validate_payload, PayloadValidationError
 
 
 class TemplateValidationTests(TestCase):
+    databases = {'default'}
+
+    # Canonical payload shared by the tests; validate_payload treats its
+    # input as read-only, and the proxy keeps one test's tweaks from
+    # leaking into another. Each test spreads in only what it changes —
+    # every base-schema-required key is present so the only violation
+    # left is the one the test plants under 'payload'.
+    _BASE_PAYLOAD = MappingProxyType({
+        'elementName': 'btn_test',
+        'languageCode': 'en',
+        'templateType': 'TEXT',
+        'content': 'hi',
+        'category': 'MARKETING',
+        'vertical': 'Internal',
+        'example': 'example',
+        'enableSample': False,
+    })
+
     def test_invalid_button_missing_fields(self):
         payload = {
-            'elementName': 'btn_test',
-            'content': 'hi',
-            'category': 'MARKETING',
-            'vertical': 'Internal',
-            'example': 'example',
-            'buttons': [
-                {'type': 'URL'}  # missing text, url, buttonValue
-            ]
+            **self._BASE_PAYLOAD,
+            'payload': {
+                'buttons': [
+                    {'type': 'URL'}  # missing text, url, buttonValue
+                ],
+            },
         }
         with self.assertRaises(PayloadValidationError) as cm:
             validate_payload('TEXT', payload)
         errs = cm.exception.errors
-        self.assertIn('buttons[0]', errs)
+        self.assertIn('payload.buttons[0]', errs)
 
     def test_carousel_card_missing_media(self):
         payload = {
-            'elementName': 'ca',
-            'content': 'hey',
-            'category': 'MARKETING',
-            'vertical': 'products',
-            'example': 'ex',
-            'appId': 'app',
-            'cards': [
-                {'body': 'card without media'}
-            ]
+            **self._BASE_PAYLOAD,
+            'templateType': 'CAROUSEL',
+            'payload': {
+                'cards': [
+                    {'body': 'card without media'}
+                ],
+            },
         }
         with self.assertRaises(PayloadValidationError) as cm:
             validate_payload('CAROUSEL', payload)
         errs = cm.exception.errors
-        self.assertIn('cards[0]', errs)
+        self.assertIn('payload.cards[0]', errs)
@@ -1,88 +1,101 @@
-import uuid
+import json
 from unittest import mock
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from rest_framework.exceptions import PermissionDenied, ValidationError
-from django.db import IntegrityError
-from django.core.exceptions import ObjectDoesNotExist
 
 from wa_templates.models import Organisation, ProviderAppInstance, WhatsAppTemplate
+from wa_templates.serializers import OrganisationSerializer
 from wa_templates.views import (
     OrganisationViewSet,
     ProviderAppInstanceViewSet,
     WhatsAppTemplateViewSet,
-    templateTypes,
-    gupshup_webhook,
-    template_schemas # Assuming this is the correct import path
 )
+from wa_templates.webhooks.gupshup_webhook import handle_gupshup_template_webhook
 
-# Mock the entire task module to prevent Celery from running during tests
-# The path should match your module structure, e.g., 'wa_templates.views.submit_template_for_approval'
-with mock.patch('wa_templates.views.submit_template_for_approval') as mock_task:
-    # --- Mock User/Authentication Setup ---
-    # Create a mock user object with the necessary attributes for JWTAuthentication
-    class MockUser:
-        def __init__(self, org_id, user_id=None):
-            self.org_id = org_id
-            self.user_id = user_id
-            self.is_authenticated = True
-
-    class MockJWTAuthentication:
-        def authenticate(self, request):
-            # Bypass actual JWT processing for testing. Use a standard org_id.
-            return (MockUser(org_id='org_A1', user_id='test_user'), None)
-    
-    # --- Setup Mocks for ViewSets ---
-    
-    # Apply mock authentication to the viewsets being tested
-    WhatsAppTemplateViewSet.authentication_classes = [MockJWTAuthentication]
-    OrganisationViewSet.authentication_classes = [MockJWTAuthentication]
-    ProviderAppInstanceViewSet.authentication_classes = [MockJWTAuthentication]
-
-    class BaseTestCase(TestCase):
-        def setUp(self):
-            # Client that automatically authenticates with org_A1
-            self.client = APIClient()
-            self.client.force_authenticate(user=MockUser(org_id='org_A1'))
-            self.org_id = 'org_A1'
-            self.app_id = 'app_B2'
-            self.base_url = f'/api/apps/{self.app_id}/templates/' 
-
-            # Create required database objects
-            self.org = Organisation.objects.create(
-                id=self.org_id,
-                name='Test Org A1'
-            )
-            self.provider_instance = ProviderAppInstance.objects.create(
-                app_id=self.app_id,
-                provider_name='gupshup',
-                organisation=self.org,
-                encrypted_app_token='dummy_encrypted_token',
-            )
-            self.template = WhatsAppTemplate.objects.create(
-                name='initial_template',
-                templateType='TEXT',
-                content='Hello {{1}}',
-                org_id=self.org,
-                provider_app_instance_app_id=self.provider_instance,
-                status='draft'
+# --- Mock User/Authentication Setup ---
+# Create a mock user object with the necessary attributes for JWTAuthentication
+class MockUser:
+    def __init__(self, org_id, user_id=None):
+        self.org_id = org_id
+        self.user_id = user_id
+        self.is_authenticated = True
+
+class MockJWTAuthentication:
+    def authenticate(self, request):
+        # Bypass actual JWT processing for testing. Use a standard org_id.
+        return (MockUser(org_id='org_A1', user_id='test_user'), None)
+
+
+class BaseTestCase(TestCase):
+    # Only the default database is touched; declaring it skips the
+    # per-class check/flush of any other configured connections.
+    databases = {'default'}
+
+    @classmethod
+    def setUpTestData(cls):
+        # Shared rows are inserted once per class inside the outer test
+        # transaction; each test method only rolls back a savepoint.
+        cls.org_id = 'org_A1'
+        cls.app_id = 'app_B2'
+
+        cls.org = Organisation.objects.create(
+            id=cls.org_id,
+            name='Test Org A1'
+        )
+        cls.provider_instance = ProviderAppInstance.objects.create(
+            app_id=cls.app_id,
+            provider_name='gupshup',
+            provider_nick_name='Test App B2',
+            organisation=cls.org,
+            encrypted_app_token=b'dummy_encrypted_token',
+            encryption_secret=b'dummy_secret',
+        )
+        cls.template = WhatsAppTemplate.objects.create(
+            elementName='initial_template',
+            languageCode='en',
+            templateType='TEXT',
+            content='Hello {{1}}',
+            org_id=cls.org,
+            provider_app_instance_app_id=cls.provider_instance,
+            status='draft'
+        )
+
+    def setUp(self):
+        # Swap in the auth bypass per test and restore the real classes
+        # afterwards, so nothing leaks into other modules in the same
+        # process (or a parallel worker).
+        for viewset in (WhatsAppTemplateViewSet, OrganisationViewSet,
+                        ProviderAppInstanceViewSet):
+            patcher = mock.patch.object(
+                viewset, 'authentication_classes', [MockJWTAuthentication]
             )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Client that automatically authenticates with org_A1
+        self.client = APIClient()
+        self.client.force_authenticate(user=MockUser(org_id='org_A1', user_id='test_user'))
 
 # --------------------------------------------------------------------------
 # OrganisationViewSet Tests
 # --------------------------------------------------------------------------
 
 class OrganisationViewSetTests(BaseTestCase):
-    def setUp(self):
-        super().setUp()
-        self.url = reverse('organisation-list') # Assuming 'organisation-list' URL name
-        self.detail_url = reverse('organisation-detail', kwargs={'pk': self.org_id})
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Resolved once per class; reverse() walks the resolver per call.
+        cls.url = reverse('organisation-list')
+        cls.detail_url = reverse('organisation-detail', kwargs={'pk': cls.org_id})
 
     # Test GET List
     def test_list_organisations(self):
-        response = self.client.get(self.url)
+        # Regression guard: the list must stay a single SELECT however many
+        # rows exist.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
 
@@ -92,28 +105,19 @@ class OrganisationViewSetTests(BaseTestCase):
         response = self.client.post(self.url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Organisation.objects.count(), 2)
-        
+
     # Test POST Create - Duplicate ID (should return 400, not 500)
     # This relies on the custom validation added in the last solution for POST
     def test_create_organisation_duplicate_id_failure(self):
         data = {'id': self.org_id, 'name': 'Some Other Name'}
-        
-        # Manually ensure the model is CharField before running the test, as per chat
-        Organisation.id = models.CharField(primary_key=True, max_length=100, editable=False) 
-        
-        # Test needs to use a serializer with the custom validation:
-        # (Assuming the final required validation from the previous answer is implemented)
-        
-        # Note: Since the serializer isn't attached here, we rely on the database or custom validator
-        # Given the previous context, testing for the expected 400 from custom validation is critical
-        
-        # Test without custom serializer logic - Expecting 500 from DB unique constraint
-        # response = self.client.post(self.url, data, format='json')
-        # self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
-        # Assuming the validator is in place:
-        with self.assertRaises(IntegrityError):
-            Organisation.objects.create(**data)
+
+        # Exercise the serializer-level duplicate check instead of sending a
+        # doomed INSERT and catching IntegrityError — a failed INSERT also
+        # invalidates the savepoint and forces an extra rollback round trip.
+        self.assertTrue(Organisation.objects.filter(id=self.org_id).exists())
+        serializer = OrganisationSerializer(data=data)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('id', serializer.errors)
 
 
 # --------------------------------------------------------------------------
@@ -121,45 +125,49 @@ class OrganisationViewSetTests(BaseTestCase):
 # --------------------------------------------------------------------------
 
 class ProviderAppInstanceViewSetTests(BaseTestCase):
-    def setUp(self):
-        super().setUp()
-        self.url = reverse('providerappinstance-list') # Assuming 'providerappinstance-list' URL name
-        self.detail_url = reverse('providerappinstance-detail', kwargs={'pk': self.app_id})
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse('providerappinstance-list')
+        cls.detail_url = reverse('providerappinstance-detail', kwargs={'pk': cls.app_id})
+        # Noise rows for another org that the list view must filter out;
+        # created once per class instead of inside each filter test.
+        cls.other_org = Organisation.objects.create(id='org_X', name='Org X')
+        cls.other_app = ProviderAppInstance.objects.create(
+            app_id='app_Y', provider_name='gupshup', provider_nick_name='Other App',
+            organisation=cls.other_org, encrypted_app_token=b'token',
+            encryption_secret=b'secret',
+        )
 
-    # Test GET List (filters by org_id)
+    # Test GET List (filters by org_id; the other-org rows from
+    # setUpTestData must NOT appear)
     def test_list_provider_apps_filtered(self):
-        # Create another org/app that should NOT be in the results
-        org2 = Organisation.objects.create(id='org_X', name='Org X')
-        ProviderAppInstance.objects.create(
-            app_id='app_Y', provider_name='gupshup', organisation=org2, encrypted_app_token='token'
-        )
-        
-        response = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
         self.assertEqual(response.data[0]['app_id'], self.app_id)
 
     # Test POST Create (sets organisation_id from user)
-    @mock.patch('wa_templates.models.Fernet')
-    def test_create_provider_app_instance(self, MockFernet):
-        MockFernet.return_value.encrypt.return_value = b'new_encrypted_token'
-        
+    def test_create_provider_app_instance(self):
+        # Real Fernet runs here: the AES path is C-backed and cheaper than
+        # a MagicMock attribute chain, and it covers the actual encryption.
         data = {
             'app_id': 'new_app',
             'provider_name': 'gupshup',
-            'app_token': 'raw_token_value' # This will be set on the serializer
+            'provider_nick_name': 'New App',
+            'app_token': 'raw_token_value'
         }
-        
-        # The serializer must handle setting the encrypted_app_token using set_app_token(raw_app_token)
-        # This test relies on the serializer being able to take 'app_token' and call set_app_token
-        # Since the serializer is not provided, we assume it's set up correctly.
+
         response = self.client.post(self.url, data, format='json')
-        
+
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['app_id'], 'new_app')
-        # Check that the org_id was correctly injected by perform_create
+        # Check that the org_id was correctly injected by the serializer context
         new_instance = ProviderAppInstance.objects.get(app_id='new_app')
         self.assertEqual(new_instance.organisation_id, self.org_id)
+        # Round-trip through the real encryption path
+        self.assertEqual(new_instance.get_app_token(), 'raw_token_value')
 
 
 # --------------------------------------------------------------------------
@@ -167,32 +175,54 @@ class ProviderAppInstanceViewSetTests(BaseTestCase):
 # --------------------------------------------------------------------------
 
 class WhatsAppTemplateViewSetTests(BaseTestCase):
-    def setUp(self):
-        super().setUp()
-        self.list_url = reverse('whatsApptemplate-list', kwargs={'app_id': self.app_id})
-        self.detail_url = reverse('whatsApptemplate-detail', kwargs={'app_id': self.app_id, 'pk': self.template.pk})
-        
-        self.create_data = {
-            'name': 'new_marketing_temp',
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.list_url = reverse('template-list', kwargs={'app_id': cls.app_id})
+        cls.detail_url = reverse('template-detail', kwargs={'app_id': cls.app_id, 'pk': cls.template.pk})
+        # template.pk is class-shared, so the action URL is too.
+        cls.approval_url = reverse('template-send-for-approval', kwargs={'app_id': cls.app_id, 'pk': cls.template.pk})
+
+        # Noise rows for a different org/app, created once per class;
+        # bulk_create keeps the template insert to one statement.
+        cls.other_org = Organisation.objects.create(id='org_X', name='Org X')
+        cls.other_app = ProviderAppInstance.objects.create(
+            app_id='app_X', provider_nick_name='Other App', organisation=cls.other_org,
+            encrypted_app_token=b'token', encryption_secret=b'secret',
+        )
+        WhatsAppTemplate.objects.bulk_create([
+            WhatsAppTemplate(
+                elementName='excluded_template', languageCode='en',
+                templateType='TEXT', content='Excluded',
+                org_id=cls.other_org, provider_app_instance_app_id=cls.other_app
+            ),
+        ])
+
+        # Full schema-valid body: validate_payload checks the whole data
+        # dict whenever a payload is present.
+        cls.create_data = {
+            'elementName': 'new_marketing_temp',
+            'languageCode': 'en',
             'templateType': 'TEXT',
             'content': 'Buy our stuff {{1}}',
+            'category': 'MARKETING',
+            'vertical': 'Internal',
+            'example': 'Buy our stuff now',
+            'enableSample': False,
             'media_url': None,
-            'payload': {'category': 'MARKETING', 'languageCode': 'en'}
+            'payload': {}
         }
 
-    # Test GET List (filters by org_id and app_id)
+    # Test GET List (filters by org_id and app_id; the other-org template
+    # from setUpTestData must be excluded)
     def test_list_templates_filtered(self):
-        # Create a template for a DIFFERENT app/org that should be excluded
-        org2 = Organisation.objects.create(id='org_X', name='Org X')
-        app2 = ProviderAppInstance.objects.create(app_id='app_X', organisation=org2, encrypted_app_token='token')
-        WhatsAppTemplate.objects.create(
-            name='excluded_template', templateType='TEXT', content='Excluded', org_id=org2, provider_app_instance_app_id=app2
-        )
-        
-        response = self.client.get(self.list_url)
+        # The template serializer exposes no FK fields, so the list must not
+        # grow per-row queries — one SELECT regardless of row count.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['name'], self.template.elementName)
+        self.assertEqual(response.data[0]['elementName'], self.template.elementName)
 
     # Test POST Create (sets status=draft, org_id, and provider_app_instance_app_id)
     def test_create_template_success(self):
@@ -202,38 +232,86 @@ class WhatsAppTemplateViewSetTests(BaseTestCase):
         self.assertEqual(new_template.org_id_id, self.org_id)
         self.assertEqual(new_template.provider_app_instance_app_id_id, self.app_id)
         self.assertEqual(new_template.status, 'draft')
-        
+
     # Test POST Create - Invalid app_id in URL
     def test_create_template_invalid_app_id(self):
-        url = reverse('whatsApptemplate-list', kwargs={'app_id': 'non_existent_app'})
+        url = reverse('template-list', kwargs={'app_id': 'non_existent_app'})
         response = self.client.post(url, self.create_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn('Provider app non_existent_app not found for this org', str(response.data))
+        self.assertIn("Provider app 'non_existent_app' not found for this org", str(response.data))
 
     # Test custom action: send_for_approval (success)
-    def test_send_for_approval_success(self):
-        url = reverse('whatsApptemplate-send-for-approval', kwargs={'app_id': self.app_id, 'pk': self.template.pk})
-        
-        # Celery task is mocked
-        mock_task.delay.return_value = True
+    @mock.patch('wa_templates.tasks.submit_template_for_approval')
+    def test_send_for_approval_success(self, mock_task):
+        # Celery task is mocked per test, so call counts can't leak between
+        # methods the way the old module-wide patch allowed.
+        mock_task.delay.return_value = mock.Mock(id='task-123')
 
-        response = self.client.post(url)
+        response = self.client.post(self.approval_url)
         self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
-        self.assertEqual(response.data['detail'], 'Submitted for approval')
-        
+        self.assertEqual(response.data['message'], 'Task enqueued')
+        self.assertEqual(response.data['task_id'], 'task-123')
+
         # Check database update
         self.template.refresh_from_db()
         self.assertEqual(self.template.status, 'pending')
         # Check Celery task was called
-        mock_task.delay.assert_called_once_with(self.template.id, self.provider_instance)
+        mock_task.delay.assert_called_once_with(self.template.pk, self.app_id, self.org_id)
 
-    # Test custom action: send_for_approval (ProviderAppInstance.DoesNotExist)
+    # Test custom action: send_for_approval (no matching template to claim)
     def test_send_for_approval_provider_not_found(self):
-        ProviderAppInstance.objects.get(app_id=self.app_id).delete() # Remove the instance
-        url = reverse('whatsApptemplate-send-for-approval', kwargs={'app_id': self.app_id, 'pk': self.template.pk})
-        response = self.client.post(url)
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-        self.assertIn('Invalid organisation or app_id', str(response.data))
+        # Deleting the provider instance cascades to its templates, so the
+        # conditional claim UPDATE matches nothing and the endpoint answers
+        # 409 without enqueuing a task.
+        ProviderAppInstance.objects.get(app_id=self.app_id).delete()
+        response = self.client.post(self.approval_url)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn('not found or already pending', str(response.data))
+
+    # Test custom action: send_for_approval (enqueue failure releases the claim)
+    @mock.patch('wa_templates.tasks.submit_template_for_approval')
+    def test_send_for_approval_enqueue_failure_releases_claim(self, mock_task):
+        mock_task.delay.side_effect = RuntimeError('broker down')
+
+        response = self.client.post(self.approval_url)
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # The claim must not leave the template stuck on 'pending', which
+        # would make every later approval attempt answer 409.
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.status, 'failed')
+
+    # Test custom action: bulk_send_for_approval (claims before enqueueing)
+    @mock.patch('celery.group')
+    @mock.patch('wa_templates.tasks.submit_template_for_approval')
+    def test_bulk_send_for_approval_claims_templates(self, mock_task, mock_group):
+        mock_group.return_value.apply_async.return_value = mock.Mock(id='group-1', children=[])
+        url = reverse('template-bulk-send-for-approval', kwargs={'app_id': self.app_id})
+
+        response = self.client.post(url, {'ids': [self.template.pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['group_id'], 'group-1')
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.status, 'pending')
+        # group() receives a lazy generator; drain it to see the signatures
+        list(mock_group.call_args.args[0])
+        mock_task.s.assert_called_once_with(self.template.pk, self.app_id, self.org_id)
+
+        # A repeat call finds every row already claimed and enqueues nothing
+        response = self.client.post(url, {'ids': [self.template.pk]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        mock_group.assert_called_once()
+
+    # A terminally failed task releases the claim through on_failure
+    def test_task_terminal_failure_releases_claim(self):
+        from wa_templates.tasks import submit_template_for_approval
+
+        WhatsAppTemplate.objects.filter(pk=self.template.pk).update(status='pending')
+        submit_template_for_approval.on_failure(
+            RuntimeError('retries exhausted'), 'task-id',
+            (self.template.pk, self.app_id, self.org_id), {}, None
+        )
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.status, 'failed')
 
 
 # --------------------------------------------------------------------------
@@ -241,49 +319,77 @@ class WhatsAppTemplateViewSetTests(BaseTestCase):
 # --------------------------------------------------------------------------
 
 class StandaloneFunctionTests(BaseTestCase):
-    
+
     # Test templateTypes API endpoint
-    @mock.patch.object(template_schemas, 'SCHEMAS', {'text': {'schema': '...'}, 'image': {'schema': '...'}})
     def test_templateTypes(self):
-        # Assuming the URL name is 'templateTypes'
         url = reverse('templateTypes')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('types', response.data)
-        self.assertIn('schemas', response.data)
-        self.assertTrue(len(response.data['types']) > 0)
-        self.assertIsInstance(response.data['schemas'], dict)
-
-
-    # Test gupshup_webhook API endpoint
-    def test_gupshup_webhook_approved_success(self):
-        # Assuming the URL name is 'gupshup_webhook'
-        url = reverse('gupshup_webhook') 
-        data = {'template_id': self.template.id, 'status': 'approved', 'extra': {'provider_id': 'abc123'}}
-        
+        # The body is pre-encoded at import time, so read the raw JSON
+        # rather than DRF's response.data.
+        body = json.loads(response.content)
+        self.assertIn('types', body)
+        self.assertIn('schemas', body)
+        self.assertTrue(len(body['types']) > 0)
+        self.assertIsInstance(body['schemas'], dict)
+
+    # Test gupshup_webhook API endpoint (enqueues the processing task)
+    @mock.patch('wa_templates.tasks.process_gupshup_webhook')
+    def test_gupshup_webhook_enqueues_task(self, mock_task):
+        mock_task.delay.return_value = mock.Mock(id='task-webhook')
+        url = reverse('gupshup_webhook')
+        data = {'type': 'template-event', 'payload': {'id': 'ptid', 'status': 'APPROVED'}}
+
         response = self.client.post(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
         self.assertEqual(response.data['detail'], 'updated')
-        
-        # Check database update
+        mock_task.delay.assert_called_once_with(data)
+
+    @mock.patch('wa_templates.tasks.process_gupshup_webhook')
+    def test_gupshup_webhook_ignores_other_event_types(self, mock_task):
+        url = reverse('gupshup_webhook')
+        response = self.client.post(url, {'type': 'message-event'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        mock_task.delay.assert_not_called()
+
+    # The task delegates to handle_gupshup_template_webhook; exercise the
+    # handler synchronously for the database effects.
+    def test_webhook_handler_approves_template(self):
+        processed = handle_gupshup_template_webhook({
+            'type': 'template-event',
+            'payload': {
+                'elementName': self.template.elementName,
+                'languageCode': self.template.languageCode,
+                'type': 'status-update',
+                'status': 'APPROVED',
+            },
+        })
+        self.assertTrue(processed)
         self.template.refresh_from_db()
         self.assertEqual(self.template.status, 'approved')
-        self.assertIn('provider_id', self.template.provider_metadata['last_webhook'])
-        
-    def test_gupshup_webhook_rejected_success(self):
-        url = reverse('gupshup_webhook')
-        data = {'template_id': self.template.id, 'status': 'rejected'}
-        
-        response = self.client.post(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        
+
+    def test_webhook_handler_rejects_template(self):
+        processed = handle_gupshup_template_webhook({
+            'type': 'template-event',
+            'payload': {
+                'elementName': self.template.elementName,
+                'languageCode': self.template.languageCode,
+                'type': 'status-update',
+                'status': 'REJECTED',
+            },
+        })
+        self.assertTrue(processed)
         self.template.refresh_from_db()
         self.assertEqual(self.template.status, 'rejected')
 
-    def test_gupshup_webhook_template_not_found(self):
-        url = reverse('gupshup_webhook')
-        data = {'template_id': 99999, 'status': 'approved'}
-        
-        response = self.client.post(url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-        self.assertEqual(response.data['detail'], 'not found')
\ No newline at end of file
+    def test_webhook_handler_template_not_found(self):
+        processed = handle_gupshup_template_webhook({
+            'type': 'template-event',
+            'payload': {
+                'elementName': 'no_such_template',
+                'languageCode': 'en',
+                'type': 'status-update',
+                'status': 'APPROVED',
+            },
+        })
+        self.assertFalse(processed)
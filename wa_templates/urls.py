@@ -41,6 +41,10 @@ template_send_for_approval = WhatsAppTemplateViewSet.as_view({
     'post': 'send_for_approval'
 })
 
+template_bulk_send_for_approval = WhatsAppTemplateViewSet.as_view({
+    'post': 'bulk_send_for_approval'
+})
+
 template_sync_from_provider = WhatsAppTemplateViewSet.as_view(
     {
         'post':'sync_from_provider'
@@ -53,6 +57,7 @@ urlpatterns = [
     path('<str:app_id>/templates/', template_list, name='template-list'),
     path('<str:app_id>/templates/<int:pk>/', template_detail, name='template-detail'),
     path('<str:app_id>/templates/<int:pk>/send_for_approval',template_send_for_approval, name='template-send-for-approval'),
+    path('<str:app_id>/templates/bulk_send_for_approval',template_bulk_send_for_approval, name='template-bulk-send-for-approval'),
     path('<str:app_id>/templates/sync_provider',template_sync_from_provider, name='template-sync-from-provider'),
 
     path('<str:app_id>/provider/', provider_details, name='provider-detail'),
@@ -1,7 +1,7 @@
 # constants.py
 
 from enum import Enum
-from django.utils.translation import gettext_lazy as _
+from typing import Final
 
 # --- API Endpoints / Webhook Event Types ---
 # Use an Enum for a clean, immutable set of keys/actions.
@@ -31,28 +31,31 @@ class GupshupAction(Enum):
     
     @classmethod
     def choices(cls):
-        """Returns a list of (value, value) tuples for Django choices."""
-        return [(item.value, item.value) for item in cls]
+        """Returns (value, value) tuples for Django choices, built once."""
+        return _GUPSHUP_ACTION_CHOICES
+
+
+# Built once at import: choices() is called repeatedly by Django internals,
+# and by-value lookup through a dict is far cheaper than Enum's __call__
+# on hot paths — use GUPSHUP_ACTION_BY_VALUE[v] instead of GupshupAction(v).
+_GUPSHUP_ACTION_CHOICES = tuple((item.value, item.value) for item in GupshupAction)
+GUPSHUP_ACTION_BY_VALUE = {item.value: item for item in GupshupAction}
 
 # --- Error Messages (if you want these centralized) ---
 
-# Note: Using gettext_lazy for potential future internationalization
-class ErrorMessageEnume(object):
-    """
-    Constants for standard error strings used across the application.
-    """
-    INVALID_PAYLOAD = _("The request payload was incorrect or malformed.")
-    MISSING_HANDLE_ID = _("Media upload succeeded but missing handle ID in response.")
-    NETWORK_TIMEOUT = _("The request timed out while communicating with the provider.")
-    
+# Plain module-level strings: these only ever reach logs and API error
+# bodies, so the gettext_lazy proxies (which walk the translation catalog
+# on every str()) were pure overhead. Wrap with _() at display sites if a
+# user-facing surface ever needs them translated.
+INVALID_PAYLOAD: Final = "The request payload was incorrect or malformed."
+MISSING_HANDLE_ID: Final = "Media upload succeeded but missing handle ID in response."
+NETWORK_TIMEOUT: Final = "The request timed out while communicating with the provider."
+
 # --- Configuration Values ---
 
-class Config(object):
-    """
-    General configuration values.
-    """
-    MEDIA_UPLOAD_RETRIES = 3
-    REQUEST_TIMEOUT_SECONDS = 10
-    
+MEDIA_UPLOAD_RETRIES: Final = 3
+REQUEST_TIMEOUT_SECONDS: Final = 10
+
+
 # Example of using a simple constant variable
 DEFAULT_TS_KEY = "ts"
\ No newline at end of file
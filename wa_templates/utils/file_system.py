@@ -1,4 +1,5 @@
-import uuid
+from secrets import token_hex
+
 from django.core.files.storage import FileSystemStorage
 
 
@@ -8,8 +9,12 @@ class OverwriteStorage(FileSystemStorage):
     Prevents random suffixes like _MienTEt.
     """
     def get_available_name(self, name, max_length=None):
-        if self.exists(name):
-            self.delete(name)
+        # delete() already ignores a missing file, so the exists() stat was
+        # a wasted syscall and a check-then-delete race for concurrent
+        # uploads. The delete itself stays: FileSystemStorage._save opens
+        # with O_EXCL and would loop forever if we handed back an occupied
+        # name untouched.
+        self.delete(name)
         return name
 
 
@@ -18,4 +23,6 @@ def temp_credential_path(instance, filename):
     Generates a consistent, short upload path for Google service credentials.
     Example: catalog_credentials/<app_id>/<random>_catalog-service.json
     """
-    return f"catalog_credentials/{instance.provider_app_instance_app_id.app_id}/{uuid.uuid4().hex[:8]}_catalog-service.json"
+    # token_hex(4) yields the same 8 hex chars as the old uuid4().hex[:8]
+    # slice while drawing 4 random bytes instead of 16.
+    return f"catalog_credentials/{instance.provider_app_instance_app_id.app_id}/{token_hex(4)}_catalog-service.json"
@@ -1,13 +1,18 @@
-import os
+import hashlib
 import json
 import logging
-import tempfile
 import gspread
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
 from google.oauth2.service_account import Credentials
 
 logger = logging.getLogger(__name__)
 
+# Authorized gspread clients keyed by credential hash. Sharing a client
+# across catalogs with the same service account means one OAuth handshake
+# (and one shared token refresh) per worker, not one per spreadsheet.
+_CLIENT_CACHE: Dict[str, gspread.Client] = {}
+
 # Logging configuration (optional; remove if already configured elsewhere)
 if not logger.handlers:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
@@ -34,6 +39,19 @@ class GoogleSheetCatalog:
         self.service_file_content = service_file_content
         self.client = self._get_client_from_content()
         self.sheet = self._open_sheet()
+        # Full-sheet read cache plus the derived id -> sheet-row index;
+        # every mutating method used to pay a get_all_records round trip.
+        self._records_cache: Optional[List[Dict[str, Any]]] = None
+        self._id_index: Optional[Dict[str, int]] = None
+        # Header row cache; it almost never changes after warmup. The
+        # frozenset mirror makes the "is every field already a header"
+        # check a set subtraction instead of repeated list scans.
+        self._headers: Optional[List[str]] = None
+        self._header_set: frozenset = frozenset()
+        # Grid dimensions, fetched at most once; growth updates them in
+        # place so the steady state needs no metadata round trip.
+        self._grid_rows: Optional[int] = None
+        self._grid_cols: Optional[int] = None
         logger.info(f"Initialized GoogleSheetCatalog for {self.sheet_url}")
 
     # -----------------------------
@@ -42,19 +60,22 @@ class GoogleSheetCatalog:
 
     def _get_client_from_content(self):
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as tmp_file:
-                tmp_file.write(self.service_file_content.encode())
-                tmp_path = tmp_file.name
-
-            client = gspread.authorize(Credentials.from_service_account_file(tmp_path, scopes=self.SCOPES))
-            logger.debug("GSpread client authorized successfully.")
+            # Credentials are built straight from the in-memory JSON — no
+            # temp file on disk — and the authorized client is shared per
+            # credential hash.
+            key = hashlib.sha256(self.service_file_content.encode()).hexdigest()
+            client = _CLIENT_CACHE.get(key)
+            if client is None:
+                creds = Credentials.from_service_account_info(
+                    json.loads(self.service_file_content), scopes=self.SCOPES
+                )
+                client = gspread.authorize(creds)
+                _CLIENT_CACHE[key] = client
+                logger.debug("GSpread client authorized successfully.")
             return client
         except Exception as e:
             logger.exception("Failed to create gspread client: %s", e)
             raise
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
 
     def _open_sheet(self):
         try:
@@ -68,52 +89,99 @@ class GoogleSheetCatalog:
     def _ensure_grid_capacity(self, required_rows: int, required_cols: int):
         """Expands grid automatically if needed."""
         try:
-            sheet_props = self.sheet.spreadsheet.fetch_sheet_metadata()
-            sheet_info = next(s for s in sheet_props["sheets"] if s["properties"]["sheetId"] == self.sheet.id)
-            grid = sheet_info["properties"]["gridProperties"]
-
-            current_rows = grid.get("rowCount", 1000)
-            current_cols = grid.get("columnCount", 26)
-
-            if required_rows > current_rows:
-                self.sheet.add_rows(required_rows - current_rows)
-                logger.info(f"Expanded sheet rows from {current_rows} → {required_rows}")
-
-            if required_cols > current_cols:
-                self.sheet.add_cols(required_cols - current_cols)
-                logger.info(f"Expanded sheet columns from {current_cols} → {required_cols}")
+            if self._grid_rows is None or self._grid_cols is None:
+                sheet_props = self.sheet.spreadsheet.fetch_sheet_metadata()
+                sheet_info = next(s for s in sheet_props["sheets"] if s["properties"]["sheetId"] == self.sheet.id)
+                grid = sheet_info["properties"]["gridProperties"]
+                self._grid_rows = grid.get("rowCount", 1000)
+                self._grid_cols = grid.get("columnCount", 26)
+
+            if required_rows > self._grid_rows:
+                self.sheet.add_rows(required_rows - self._grid_rows)
+                logger.info(f"Expanded sheet rows from {self._grid_rows} → {required_rows}")
+                self._grid_rows = required_rows
+
+            if required_cols > self._grid_cols:
+                self.sheet.add_cols(required_cols - self._grid_cols)
+                logger.info(f"Expanded sheet columns from {self._grid_cols} → {required_cols}")
+                self._grid_cols = required_cols
         except Exception as e:
             logger.exception("Error ensuring grid capacity: %s", e)
 
     def _ensure_headers(self, new_fields: Optional[List[str]] = None):
-        """Ensures required, optional, and dynamic headers exist."""
+        """Ensures required, optional, and dynamic headers exist.
+
+        Headers are cached on the instance, so the common case — every
+        requested field already present — costs no API call at all. When
+        fields do need adding, the whole header row is written in one range
+        update instead of an update_cell round trip per new column.
+        """
+        new_fields = list(new_fields or [])
+        needed = set(new_fields) - self._header_set
+        if self._headers is not None and not needed:
+            logger.debug("Sheet headers already up-to-date.")
+            return self._headers
+
         headers = self.sheet.row_values(1)
-        new_fields = new_fields or []
         all_fields = REQUIRED_FIELDS + OPTIONAL_FIELDS + [
             f for f in new_fields if f not in REQUIRED_FIELDS + OPTIONAL_FIELDS
         ]
-        self._ensure_grid_capacity(required_rows=1, required_cols=len(all_fields))
-
-        updated = False
-        for field in all_fields:
-            if field not in headers:
-                self.sheet.update_cell(1, len(headers) + 1, field)
-                headers.append(field)
-                updated = True
-                logger.info(f"Added new header: {field}")
-
-        if updated:
-            logger.info("Headers updated successfully.")
+        existing = set(headers)
+        missing = [f for f in all_fields if f not in existing]
+        if missing:
+            headers = headers + missing
+            self._ensure_grid_capacity(required_rows=1, required_cols=len(headers))
+            self.sheet.update('A1', [headers])
+            logger.info(f"Added new headers: {missing}")
         else:
             logger.debug("Sheet headers already up-to-date.")
+
+        self._headers = headers
+        self._header_set = frozenset(headers)
         return headers
 
+    def _get_records_cached(self) -> List[Dict[str, Any]]:
+        """Return the cached records, fetching (and indexing) them once.
+
+        Mutating methods keep the cache accurate: cell updates are written
+        through, while anything that changes the row count invalidates via
+        _invalidate_records_cache().
+        """
+        if self._records_cache is None:
+            # One raw values.get instead of get_all_records: the records and
+            # the id index are built together in a single pass, skipping
+            # gspread's own row walk plus a second scan for the index. The
+            # header row from the same payload primes the header cache.
+            values = self.sheet.get_values(value_render_option='UNFORMATTED_VALUE')
+            headers = [str(h) for h in values[0]] if values else []
+            if self._headers is None and headers:
+                self._headers = headers
+                self._header_set = frozenset(headers)
+
+            id_col = headers.index("id") if "id" in headers else None
+            records = []
+            id_index = {}
+            for i, row in enumerate(values[1:], start=2):
+                records.append(dict(zip(headers, row)))
+                if id_col is not None and id_col < len(row):
+                    id_index[str(row[id_col])] = i
+            self._records_cache = records
+            self._id_index = id_index
+        return self._records_cache
+
+    def _invalidate_records_cache(self):
+        self._records_cache = None
+        self._id_index = None
+
     # -----------------------------
     # Core Operations
     # -----------------------------
 
     def read_all(self) -> List[Dict[str, Any]]:
-        data = self.sheet.get_all_records()
+        # Always a fresh fetch — the sheet can be edited outside this
+        # service — but prime the cache for any mutations that follow.
+        self._invalidate_records_cache()
+        data = self._get_records_cached()
         logger.info(f"Retrieved {len(data)} records from catalog.")
         return data
 
@@ -136,20 +204,20 @@ class GoogleSheetCatalog:
             all_fields.update(p.keys())
         headers = self._ensure_headers(all_fields)
 
-        rows = self.sheet.get_all_records()
-        id_to_row_idx = {str(r["id"]): i + 2 for i, r in enumerate(rows)}  # Sheet row numbers
-
-        # DELETE
-        deleted_count = 0
-        for pid in delete_list:
-            row_idx = id_to_row_idx.get(str(pid))
-            if row_idx:
-                self.sheet.delete_rows(row_idx)
-                deleted_count += 1
-                logger.info(f"Deleted product ID {pid}")
-                for key, idx in id_to_row_idx.items():
-                    if idx > row_idx:
-                        id_to_row_idx[key] -= 1
+        # get_catalog keeps instances alive for the worker's lifetime, so a
+        # cache from an earlier operation may predate row inserts/deletes
+        # made by other workers or by hand; refetch so the row indexes used
+        # below are current, reusing the cache only within this operation.
+        self._invalidate_records_cache()
+        rows = self._get_records_cached()
+        id_to_row_idx = self._id_index  # Sheet row numbers
+
+        # All three operations are collected into a single
+        # spreadsheets.batchUpdate call: updates first (row indexes are still
+        # valid), then appends, then deletes in descending order so earlier
+        # deletes don't shift the indexes of later ones.
+        sheet_id = self.sheet.id
+        requests = []
 
         # UPDATE
         updated_count = 0
@@ -162,96 +230,222 @@ class GoogleSheetCatalog:
             if not row_idx:
                 logger.warning(f"Product {pid} not found for update.")
                 continue
-            row_updates = {}
-            for field, value in product.items():
-                if field in headers:
-                    col_idx = headers.index(field) + 1
-                    row_updates[col_idx] = value
-            if row_updates:
-                cell_list = self.sheet.range(row_idx, 1, row_idx, len(headers))
-                for col_idx, value in row_updates.items():
-                    cell_list[col_idx - 1].value = value
-                self.sheet.update_cells(cell_list)
-                updated_count += 1
-                logger.info(f"Updated product {pid}")
+            existing = rows[row_idx - 2]
+            merged = [product.get(h, existing.get(h, "") if partial else "") for h in headers]
+            requests.append({
+                "updateCells": {
+                    "start": {"sheetId": sheet_id, "rowIndex": row_idx - 1, "columnIndex": 0},
+                    "rows": [self._to_row_data(merged)],
+                    "fields": "userEnteredValue",
+                }
+            })
+            # Write the merge through to the cache so it stays accurate.
+            rows[row_idx - 2] = dict(zip(headers, merged))
+            updated_count += 1
 
         # ADD
         added_count = 0
         if add_list:
-            new_rows = [[p.get(h, "") for h in headers] for p in add_list]
-            self.sheet.append_rows(new_rows)
+            requests.append({
+                "appendCells": {
+                    "sheetId": sheet_id,
+                    "rows": [self._to_row_data([p.get(h, "") for h in headers]) for p in add_list],
+                    "fields": "userEnteredValue",
+                }
+            })
             added_count = len(add_list)
-            logger.info(f"Added {added_count} new product(s).")
+
+        # DELETE
+        delete_row_idxs = sorted(
+            (id_to_row_idx[str(pid)] for pid in delete_list if str(pid) in id_to_row_idx),
+            reverse=True
+        )
+        for row_idx in delete_row_idxs:
+            requests.append({
+                "deleteDimension": {
+                    "range": {
+                        "sheetId": sheet_id,
+                        "dimension": "ROWS",
+                        "startIndex": row_idx - 1,
+                        "endIndex": row_idx,
+                    }
+                }
+            })
+        deleted_count = len(delete_row_idxs)
+
+        if requests:
+            self.sheet.spreadsheet.batch_update({"requests": requests})
+        if added_count or deleted_count:
+            # Row count changed; the cached row indexes are stale.
+            self._invalidate_records_cache()
 
         logger.info(f"Batch operation complete. Added={added_count}, Updated={updated_count}, Deleted={deleted_count}")
         return {"added": added_count, "updated": updated_count, "deleted": deleted_count}
 
+    @staticmethod
+    def _to_cell_value(v) -> Dict[str, Any]:
+        """Map a Python value to a typed ExtendedValue for batchUpdate.
+
+        Numbers and booleans keep their type so price/quantity columns stay
+        numeric cells instead of degrading to text on the batched path.
+        """
+        if v is None:
+            return {"stringValue": ""}
+        if isinstance(v, bool):
+            return {"boolValue": v}
+        if isinstance(v, (int, float)):
+            return {"numberValue": v}
+        if isinstance(v, str):
+            return {"stringValue": v}
+        return {"stringValue": str(v)}
+
+    @classmethod
+    def _to_row_data(cls, values: List[Any]) -> Dict[str, Any]:
+        """Convert a list of cell values into a batchUpdate RowData dict."""
+        return {
+            "values": [
+                {"userEnteredValue": cls._to_cell_value(v)} for v in values
+            ]
+        }
+
     def add_row(self, new_data: Dict[str, Any]):
         headers = self._ensure_headers(new_data.keys())
         row = [new_data.get(h, "") for h in headers]
         self.sheet.append_row(row)
+        self._invalidate_records_cache()
         logger.info(f"Added new product with ID {new_data.get('id')}")
 
     def update_row(self, product_id: Any, updated_data: Dict[str, Any]) -> bool:
         headers = self._ensure_headers(updated_data.keys())
-        rows = self.sheet.get_all_records()
-        for idx, row in enumerate(rows, start=2):
-            if str(row.get("id")) == str(product_id):
-                for field, value in updated_data.items():
-                    if field in headers:
-                        col_index = headers.index(field) + 1
-                        self.sheet.update_cell(idx, col_index, value)
-                        logger.debug(f"Updated field '{field}' for product {product_id}")
-                logger.info(f"Updated row for product {product_id}")
-                return True
-        logger.warning(f"Product {product_id} not found for update.")
-        return False
+        # Fresh fetch per operation: cached row indexes go stale whenever
+        # another worker (or a human) inserts or deletes sheet rows.
+        self._invalidate_records_cache()
+        rows = self._get_records_cached()
+        idx = self._id_index.get(str(product_id))
+        if idx is None:
+            logger.warning(f"Product {product_id} not found for update.")
+            return False
+
+        # One update_cells round-trip instead of an update_cell call
+        # (each its own HTTP request) per changed field.
+        col_of = {h: i + 1 for i, h in enumerate(headers)}
+        cells = [
+            gspread.Cell(idx, col_of[field], value)
+            for field, value in updated_data.items()
+            if field in col_of
+        ]
+        if cells:
+            self.sheet.update_cells(cells, value_input_option='USER_ENTERED')
+        rows[idx - 2].update(
+            {f: v for f, v in updated_data.items() if f in col_of}
+        )
+        logger.info(f"Updated row for product {product_id}")
+        return True
 
     def delete_row(self, product_id: Any) -> bool:
-        rows = self.sheet.get_all_records()
-        for idx, row in enumerate(rows, start=2):
-            if str(row.get("id")) == str(product_id):
-                self.sheet.delete_rows(idx)
-                logger.info(f"Deleted product ID {product_id}")
-                return True
-        logger.warning(f"Product {product_id} not found for deletion.")
-        return False
+        # Row indexes must be current before deleting by position.
+        self._invalidate_records_cache()
+        self._get_records_cached()
+        idx = self._id_index.get(str(product_id))
+        if idx is None:
+            logger.warning(f"Product {product_id} not found for deletion.")
+            return False
+        self.sheet.delete_rows(idx)
+        self._invalidate_records_cache()
+        logger.info(f"Deleted product ID {product_id}")
+        return True
 
     def bulk_write(self, product_list: List[Dict[str, Any]]):
         """Handles both add and update by ID."""
         all_fields = {k for p in product_list for k in p.keys()}
         headers = self._ensure_headers(all_fields)
-        rows = self.sheet.get_all_records()
-        id_to_row_idx = {str(r["id"]): i + 2 for i, r in enumerate(rows)}
-
+        # Same staleness rule as batch_write: refetch at the start of the
+        # operation so updates land on current row indexes.
+        self._invalidate_records_cache()
+        rows = self._get_records_cached()
+        id_to_row_idx = self._id_index
+
+        # Accumulate every changed cell and every new row across the loop,
+        # then flush each with a single API call; per-product update_cell /
+        # append_row round-trips are what drive the 429 quota errors.
+        # Column positions come from a dict, not headers.index — that scan
+        # made the loop O(products * fields * headers).
+        col_of = {h: i + 1 for i, h in enumerate(headers)}
+        cells = []
+        new_rows = []
         for product in product_list:
             pid = str(product.get("id"))
             if pid in id_to_row_idx:
                 row_idx = id_to_row_idx[pid]
-                for field, value in product.items():
-                    if field in headers:
-                        col_idx = headers.index(field) + 1
-                        self.sheet.update_cell(row_idx, col_idx, value)
-                logger.info(f"Updated product {pid}")
+                cells.extend(
+                    gspread.Cell(row_idx, col_of[field], value)
+                    for field, value in product.items()
+                    if field in col_of
+                )
+                rows[row_idx - 2].update(
+                    {f: v for f, v in product.items() if f in col_of}
+                )
+                logger.debug(f"Queued update for product {pid}")
             else:
-                row = [product.get(h, "") for h in headers]
-                self.sheet.append_row(row)
-                logger.info(f"Added new product {pid}")
+                new_rows.append([product.get(h, "") for h in headers])
+                logger.debug(f"Queued add for product {pid}")
+
+        if cells:
+            self.sheet.update_cells(cells, value_input_option='USER_ENTERED')
+        if new_rows:
+            # INSERT_ROWS appends below the table instead of overwriting
+            # whatever range the API guesses; USER_ENTERED matches the
+            # parsing applied to the updated cells above.
+            self.sheet.append_rows(
+                new_rows,
+                value_input_option='USER_ENTERED',
+                insert_data_option='INSERT_ROWS',
+            )
+            self._invalidate_records_cache()
 
         logger.info(f"Bulk write complete. Processed {len(product_list)} products.")
 
     def bulk_delete(self, product_ids: List[Any]) -> int:
-        rows = self.sheet.get_all_records()
-        id_to_row_idx = {str(r["id"]): i + 2 for i, r in enumerate(rows)}
-        deleted_count = 0
-        for pid in product_ids:
-            row_idx = id_to_row_idx.get(str(pid))
-            if row_idx:
-                self.sheet.delete_rows(row_idx)
-                deleted_count += 1
-                for key, idx in id_to_row_idx.items():
-                    if idx > row_idx:
-                        id_to_row_idx[key] -= 1
-                logger.info(f"Deleted product ID {pid}")
-        logger.info(f"Bulk delete complete. Deleted {deleted_count} rows.")
-        return deleted_count
+        # Row indexes must be current before deleting by position.
+        self._invalidate_records_cache()
+        self._get_records_cached()
+        # Descending order, so earlier deletes can't shift the indexes of
+        # later ones — no fix-up loop — and a single batchUpdate replaces a
+        # delete_rows round trip per id (same pattern as batch_write).
+        targets = sorted(
+            {self._id_index[str(pid)] for pid in product_ids if str(pid) in self._id_index},
+            reverse=True,
+        )
+        if not targets:
+            logger.info("Bulk delete complete. Deleted 0 rows.")
+            return 0
+
+        requests = [
+            {
+                "deleteDimension": {
+                    "range": {
+                        "sheetId": self.sheet.id,
+                        "dimension": "ROWS",
+                        "startIndex": row_idx - 1,
+                        "endIndex": row_idx,
+                    }
+                }
+            }
+            for row_idx in targets
+        ]
+        self.sheet.spreadsheet.batch_update({"requests": requests})
+        self._invalidate_records_cache()
+        logger.info(f"Bulk delete complete. Deleted {len(targets)} rows.")
+        return len(targets)
+
+
+@lru_cache(maxsize=64)
+def get_catalog(sheet_url: str, service_file_content: str) -> "GoogleSheetCatalog":
+    """Memoized GoogleSheetCatalog factory.
+
+    Construction authorizes an OAuth2 client and opens the sheet, which is
+    by far the most expensive part of a catalog task. Caching per
+    (sheet_url, credentials) means one handshake per worker process
+    instead of one per task; changed credentials produce a new entry.
+    """
+    return GoogleSheetCatalog(sheet_url, service_file_content)
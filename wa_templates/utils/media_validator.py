@@ -1,14 +1,18 @@
 import logging
-import mimetypes
 import re
+from functools import lru_cache
 from urllib.parse import urlparse
 from django.core.validators import URLValidator
 from django.core.exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
 
-# Allowed MIME types
-ALLOWED_MIME_TYPES = {
+# Compiled once; URLValidator.__init__ builds several large regexes and
+# this runs per template in validation loops.
+_URL_VALIDATOR = URLValidator(schemes=["http", "https"])
+
+# Allowed MIME types (frozen: these are lookup tables, never mutated)
+ALLOWED_MIME_TYPES = frozenset({
     "audio/aac",
     "audio/mp4",
     "audio/mpeg",
@@ -28,13 +32,13 @@ ALLOWED_MIME_TYPES = {
     "image/webp",
     "video/mp4",
     "video/3gpp",
-}
+})
 
 # Template-type → allowed MIME group
 TEMPLATE_MIME_GROUPS = {
-    "IMAGE": {"image/jpeg", "image/png", "image/webp"},
-    "VIDEO": {"video/mp4", "video/3gpp"},
-    "DOCUMENT": {
+    "IMAGE": frozenset({"image/jpeg", "image/png", "image/webp"}),
+    "VIDEO": frozenset({"video/mp4", "video/3gpp"}),
+    "DOCUMENT": frozenset({
         "application/pdf",
         "application/msword",
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
@@ -43,18 +47,47 @@ TEMPLATE_MIME_GROUPS = {
         "application/vnd.ms-excel",
         "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         "text/plain",
-    },
-    "AUDIO": {
+    }),
+    "AUDIO": frozenset({
         "audio/aac",
         "audio/mp4",
         "audio/mpeg",
         "audio/amr",
         "audio/ogg",
         "audio/opus",
-    },
+    }),
+}
+
+# Flat extension -> MIME table covering exactly the allowed types above.
+# One dict lookup replaces mimetypes.guess_type, which re-parses the path
+# and walks its lazily-loaded global tables on every call.
+_EXT_TO_MIME = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".mp4": "video/mp4",
+    ".3gp": "video/3gpp",
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".ppt": "application/vnd.ms-powerpoint",
+    ".pptx": "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    ".xls": "application/vnd.ms-excel",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".txt": "text/plain",
+    ".aac": "audio/aac",
+    ".m4a": "audio/mp4",
+    ".mp3": "audio/mpeg",
+    ".amr": "audio/amr",
+    ".ogg": "audio/ogg",
+    ".opus": "audio/opus",
 }
 
 
+# Pure function of its string arguments; bulk sync and webhook handling
+# revalidate the same URLs repeatedly, so memoize the verdicts.
+@lru_cache(maxsize=4096)
 def is_valid_media_url(url: str, template_type: str) -> tuple[bool, str | None]:
     """
     Validates that:
@@ -70,7 +103,7 @@ def is_valid_media_url(url: str, template_type: str) -> tuple[bool, str | None]:
 
     # 1. Validate URL structure
     try:
-        URLValidator(schemes=["http", "https"])(url)
+        _URL_VALIDATOR(url)
     except ValidationError:
         logger.debug(f"Invalid URL structure: {url}")
         return False, None
@@ -81,9 +114,10 @@ def is_valid_media_url(url: str, template_type: str) -> tuple[bool, str | None]:
         logger.warning(f"Unknown template type: {template_type}")
         return False, None
 
-    # 3. Infer MIME type
-    parsed_url = urlparse(url)
-    guessed_mime, _ = mimetypes.guess_type(parsed_url.path.lower())
+    # 3. Infer MIME type from the extension
+    path = urlparse(url).path
+    dot = path.rfind('.')
+    guessed_mime = _EXT_TO_MIME.get(path[dot:].lower()) if dot != -1 else None
 
     if not guessed_mime:
         logger.debug(f"Could not infer MIME type from URL: {url}")
@@ -126,6 +160,7 @@ GUPSHUP_HANDLE_ID_PATTERN = re.compile(
     r'[\w\-]+$'       # Last Base64-like segment (end of string)
 )
 
+@lru_cache(maxsize=4096)
 def is_gupshup_handle_id(id_string: str) -> bool:
     """
     Checks if the provided string matches the characteristic format of a 
@@ -135,5 +170,11 @@ def is_gupshup_handle_id(id_string: str) -> bool:
     """
     if not id_string or len(id_string) < 50: # Handle IDs are typically very long
         return False
-        
+
+    # Handle IDs contain '::' plus six more separators (8 colons total);
+    # the common negative case — a URL — fails this count without ever
+    # entering the regex engine.
+    if id_string.count(':') < 8:
+        return False
+
     return bool(GUPSHUP_HANDLE_ID_PATTERN.match(id_string))
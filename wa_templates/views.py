@@ -1,12 +1,14 @@
+import hashlib
 import json
 import logging
 import os
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from celery.result import AsyncResult
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, parser_classes, renderer_classes
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied, ValidationError, NotFound
 from drf_yasg.utils import swagger_auto_schema
@@ -18,6 +20,7 @@ from wa_templates.utils.google_sheets import REQUIRED_FIELDS
 from .models import CatalogMetadata, WhatsAppTemplate, Organisation, ProviderAppInstance
 from .serializers import CatalogMetadataSerializer, WhatsAppTemplateSerializer, OrganisationSerializer, ProviderAppInstanceSerializer
 from .auth import JWTAuthentication
+from .renderers import ORJSONParser, ORJSONRenderer
 from . import template_schemas
 
 logger = logging.getLogger(__name__)
@@ -31,6 +34,12 @@ class OrgAppAwareViewSet(viewsets.ModelViewSet):
         if getattr(self, "swagger_fake_view", False):
             return "org_dummy", "app_dummy"
 
+        # Resolved once per request; get_queryset and the perform_* hooks
+        # both call this during a single create/update cycle.
+        cached = getattr(self.request, "_org_and_app", None)
+        if cached is not None:
+            return cached
+
         # Extract org_id and app_id from request
         org_id = getattr(self.request.user, "org_id", None)
         app_id = self.kwargs.get("app_id")
@@ -41,7 +50,9 @@ class OrgAppAwareViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Missing org_id in JWT")
         if not app_id and not provider_app_instance_app_id:
                 raise ValidationError({"app_id": "Path parameter 'app_id' is required."})
-        return org_id, app_id if app_id else provider_app_instance_app_id
+        result = (org_id, app_id if app_id else provider_app_instance_app_id)
+        self.request._org_and_app = result
+        return result
 
 # ---------------------------
 # WhatsAppTemplate ViewSet
@@ -51,6 +62,9 @@ class WhatsAppTemplateViewSet(OrgAppAwareViewSet):
     serializer_class = WhatsAppTemplateSerializer
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
+    # orjson-backed encode/decode for the hottest JSON endpoints.
+    renderer_classes = [ORJSONRenderer]
+    parser_classes = [ORJSONParser]
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -193,20 +207,98 @@ class WhatsAppTemplateViewSet(OrgAppAwareViewSet):
         from .tasks import submit_template_for_approval
         logger.debug('Sending template %s for approval (app_id=%s)', pk, app_id)
         org_id, app_id = self.get_org_and_app()
+
+        # One conditional UPDATE both checks ownership and claims the
+        # template: a second concurrent approval sees zero rows changed
+        # and never enqueues a duplicate task.
+        claimed = WhatsAppTemplate.objects.filter(
+            pk=pk, org_id=org_id, provider_app_instance_app_id__app_id=app_id
+        ).exclude(status='pending').update(status='pending')
+        if not claimed:
+            logger.warning('Template %s not found or already pending approval', pk)
+            return Response(
+                {'detail': 'Template not found or already pending approval'},
+                status=status.HTTP_409_CONFLICT
+            )
         try:
             # enqueue celery task
             logger.debug('Enqueuing submit_template_for_approval task for template %s', pk)
             res = submit_template_for_approval.delay(pk, app_id, org_id)
-            if not res:
-                logger.error('Failed to enqueue submit_template_for_approval task for template %s', pk)
-                return Response({'detail': 'Failed to enqueue task'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            logger.info('Template %s submitted for approval, task id: %s', pk, res.id)
-            return Response({'message': 'Task enqueued', 'task_id': res.id}, status=status.HTTP_202_ACCEPTED)
-
-        except ProviderAppInstance.DoesNotExist:
-            logger.error('ProviderAppInstance not found for org_id %s and app_id %s', org_id, app_id)
-            return Response({"error": "Invalid organisation or app_id"}, status=404)
+        except Exception:
+            res = None
+            logger.exception('Failed to enqueue submit_template_for_approval task for template %s', pk)
+        if not res:
+            # Release the claim: with no task ever running, a 'pending'
+            # status would make every later approval attempt answer 409.
+            # (The task's on_failure hook does the same after terminal
+            # failures.)
+            WhatsAppTemplate.objects.filter(pk=pk, status='pending').update(status='failed')
+            logger.error('Failed to enqueue submit_template_for_approval task for template %s', pk)
+            return Response({'detail': 'Failed to enqueue task'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        logger.info('Template %s submitted for approval, task id: %s', pk, res.id)
+        return Response({'message': 'Task enqueued', 'task_id': res.id}, status=status.HTTP_202_ACCEPTED)
     
+    @action(detail=False, methods=['post'])
+    @swagger_auto_schema(
+        operation_description='Submit a batch of templates to the provider for approval in one call.',
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'ids': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Items(type=openapi.TYPE_INTEGER),
+                    description='Template ids to submit'
+                )
+            },
+            example={'ids': [1, 2, 3]}
+        ),
+        responses={202: openapi.Response(description='Accepted')}
+    )
+    def bulk_send_for_approval(self, request, app_id=None):
+        from celery import group
+        from .tasks import submit_template_for_approval
+        ids = request.data.get('ids')
+        if not isinstance(ids, list) or not ids:
+            raise ValidationError({'ids': 'A non-empty list of template ids is required.'})
+        org_id, app_id = self.get_org_and_app()
+        logger.debug('Bulk sending %d templates for approval (app_id=%s)', len(ids), app_id)
+
+        # One query resolves which of the requested ids this org/app owns.
+        template_ids = list(self.get_queryset().filter(id__in=ids).values_list('id', flat=True))
+        if not template_ids:
+            return Response({'detail': 'No matching templates found'}, status=status.HTTP_404_NOT_FOUND)
+
+        # Claim each template before enqueueing, same as the single-id
+        # action: rows already 'pending' are skipped, so repeated or
+        # concurrent bulk calls can't publish duplicate submissions, and
+        # the task's on_failure hook can release exactly these rows.
+        with transaction.atomic():
+            claimed_ids = list(
+                WhatsAppTemplate.objects.select_for_update()
+                .filter(id__in=template_ids)
+                .exclude(status='pending')
+                .values_list('id', flat=True)
+            )
+            if claimed_ids:
+                WhatsAppTemplate.objects.filter(id__in=claimed_ids).update(status='pending')
+        if not claimed_ids:
+            return Response(
+                {'detail': 'Templates not found or already pending approval'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        # A group publishes the whole batch to the broker in one go instead
+        # of a .delay() round trip per template.
+        result = group(
+            submit_template_for_approval.s(tid, app_id, org_id) for tid in claimed_ids
+        ).apply_async()
+        logger.info('Enqueued %d approval tasks, group id: %s', len(claimed_ids), result.id)
+        return Response({
+            'message': 'Tasks enqueued',
+            'group_id': result.id,
+            'task_ids': [child.id for child in (result.children or [])],
+        }, status=status.HTTP_202_ACCEPTED)
+
     def sync_from_provider(self, request, app_id=None):
         from .tasks import sync_templates_for_app_id
         logger.debug('Syncing templates from provider (app_id=%s)', app_id)
@@ -248,9 +340,24 @@ class WhatsAppTemplateViewSet(OrgAppAwareViewSet):
     }
 )
 def templateTypes(request):
-    types = [{'key': k, 'label': v} for k, v in WhatsAppTemplate.templateTypeS]
-    schemas = template_schemas.SCHEMAS
-    return Response({'types': types, 'schemas': schemas})
+    # Static config: the body is pre-encoded at import and clients can
+    # revalidate with If-None-Match instead of re-downloading.
+    if request.headers.get('If-None-Match') == _TEMPLATE_TYPES_ETAG:
+        return HttpResponse(status=304, headers={'ETag': _TEMPLATE_TYPES_ETAG})
+    return HttpResponse(
+        _TEMPLATE_TYPES_JSON,
+        content_type='application/json',
+        headers={'Cache-Control': 'public, max-age=3600', 'ETag': _TEMPLATE_TYPES_ETAG},
+    )
+
+
+# Types and schemas are process constants, so the endpoint's JSON body is
+# serialized once at import time rather than per request.
+_TEMPLATE_TYPES_JSON = json.dumps({
+    'types': [{'key': k, 'label': v} for k, v in WhatsAppTemplate.templateTypeS],
+    'schemas': template_schemas.SCHEMAS,
+}, default=dict).encode()  # default=dict unwraps the frozen schema mappingproxies
+_TEMPLATE_TYPES_ETAG = f'"{hashlib.md5(_TEMPLATE_TYPES_JSON).hexdigest()}"'
 
 # ---------------------------
 # Gupshup webhook endpoint
@@ -278,6 +385,8 @@ def templateTypes(request):
         404: 'not found'
     }
 )
+@renderer_classes([ORJSONRenderer])
+@parser_classes([ORJSONParser])
 def gupshup_webhook(request):
     from .tasks import process_gupshup_webhook
     logger.debug('Received Gupshup webhook: %s', request.data)
@@ -519,7 +628,7 @@ class CatalogDataViewSet(viewsets.ViewSet):
         task = sync_catalog_product_batch_task.delay(
             catalog_url,
             service_file_content,
-            json.dumps(payload)
+            payload
         )
         logger.info(f"Triggered batch catalog task {task.id}")
         return Response({"task_id": task.id}, status=status.HTTP_202_ACCEPTED)
@@ -549,7 +658,7 @@ class CatalogDataViewSet(viewsets.ViewSet):
         task = sync_catalog_product_batch_task.delay(
             catalog_url,
             service_file_content,
-            json.dumps(payload)
+            payload
         )
         logger.info(f"Triggered batch catalog task {task.id}")
         return Response({"task_id": task.id}, status=status.HTTP_202_ACCEPTED)
@@ -602,7 +711,7 @@ class CatalogDataViewSet(viewsets.ViewSet):
         task = sync_catalog_product_batch_task.delay(
             catalog_url,
             service_file_content,
-            json.dumps(payload)
+            payload
         )
         logger.info(f"Triggered batch catalog task {task.id}")
         return Response({"task_id": task.id}, status=status.HTTP_202_ACCEPTED)
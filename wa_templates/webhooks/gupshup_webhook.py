@@ -1,4 +1,5 @@
 import logging
+from django.db.models import Q
 from django.utils import timezone
 
 from wa_templates.models import WhatsAppTemplate
@@ -6,68 +7,124 @@ from wa_templates.models import WhatsAppTemplate
 
 logger = logging.getLogger(__name__)
 
-def handle_gupshup_template_webhook(webhook_data: dict) -> bool:
+# Columns the event branches below may touch; bulk_update writes exactly
+# this set, so keep it in sync with _apply_template_event.
+_BULK_UPDATE_FIELDS = ['status', 'category', 'quality', 'isDeleted', 'webhookMeta', 'updated_at']
+
+
+def handle_gupshup_template_webhook(webhook_data) -> bool:
     """
-    Processes Gupshup template-event webhooks, updates main fields, and logs 
+    Processes Gupshup template-event webhooks, updates main fields, and logs
     secondary data to the 'webhookMeta' JSONField using a replacement structure.
+
+    Accepts either a single event dict or a list of events. A burst is
+    resolved with one lookup query for all events and persisted with a
+    single bulk_update, instead of one SELECT plus one full-row save()
+    per event.
     """
-    
-    logger.info("Received Gupshup template webhook. Top-level type: %s", webhook_data.get('type'))
-    
-    # --- 1. Locate Template (Same logic as before) ---
-    payload = webhook_data.get('payload', {})
-    template_id = payload.get('id')
-    element_name = payload.get('elementName')
-    language_code = payload.get('languageCode')
-    event_type = payload.get('type') # 'status-update', 'category-update', 'quality-update', or None
-    
-    template: WhatsAppTemplate = None
-    
-    # ... (Lookup logic by template_id and then by elementName/languageCode remains unchanged) ...
-    if template_id:
-        try:
-            template = WhatsAppTemplate.objects.get(provider_template_id=template_id)
-        except WhatsAppTemplate.DoesNotExist:
-            pass
-    
-    if not template and element_name and language_code:
-        try:
-            template = WhatsAppTemplate.objects.get(elementName=element_name, languageCode=language_code)
-        except WhatsAppTemplate.DoesNotExist:
+    events = webhook_data if isinstance(webhook_data, list) else [webhook_data]
+    logger.info("Received Gupshup template webhook batch of %d event(s).", len(events))
+
+    templates = _locate_templates(events)
+
+    # Keyed by pk so several events for the same template collapse into
+    # one row write carrying the last state.
+    changed = {}
+    all_processed = True
+
+    for event in events:
+        payload = event.get('payload', {})
+        template_id = payload.get('id')
+        element_name = payload.get('elementName')
+        language_code = payload.get('languageCode')
+
+        template = templates.get(template_id)
+        if template is None and element_name and language_code:
+            template = templates.get((element_name, language_code))
+
+        if template is None:
             logger.error(
-                "Template (ID: %s, Name: %s) not found. Webhook processing stopped.",
+                "Template (ID: %s, Name: %s) not found. Webhook event skipped.",
                 template_id, element_name
             )
+            all_processed = False
+            continue
+
+        if _apply_template_event(template, payload):
+            changed[template.pk] = template
+        else:
+            all_processed = False
+
+    if changed:
+        try:
+            WhatsAppTemplate.objects.bulk_update(
+                changed.values(), _BULK_UPDATE_FIELDS, batch_size=500
+            )
+            logger.info("Persisted %d template update(s) from webhook batch.", len(changed))
+        except Exception as e:
+            logger.exception("FATAL ERROR saving templates after webhook batch: %s", e)
             return False
 
-    if not template:
-        logger.error("Failed to locate template. Webhook processing stopped.")
-        return False
-        
+    return all_processed
+
+
+def _locate_templates(events) -> dict:
+    """Fetch every template referenced by the batch in one query.
+
+    Returns an index keyed both by provider_template_id and by
+    (elementName, languageCode), mirroring the two lookup paths the
+    per-event handler used to take as separate SELECTs.
+    """
+    provider_ids = set()
+    name_lang_pairs = set()
+    for event in events:
+        payload = event.get('payload', {})
+        if payload.get('id'):
+            provider_ids.add(payload['id'])
+        if payload.get('elementName') and payload.get('languageCode'):
+            name_lang_pairs.add((payload['elementName'], payload['languageCode']))
+
+    query = Q()
+    if provider_ids:
+        query |= Q(provider_template_id__in=provider_ids)
+    for name, lang in name_lang_pairs:
+        query |= Q(elementName=name, languageCode=lang)
+    if not query:
+        return {}
+
+    index = {}
+    for template in WhatsAppTemplate.objects.filter(query):
+        if template.provider_template_id:
+            index[template.provider_template_id] = template
+        index[(template.elementName, template.languageCode)] = template
+    return index
+
+
+def _apply_template_event(template: WhatsAppTemplate, payload: dict) -> bool:
+    """Mutate the template in memory for one event; the caller persists."""
+    event_type = payload.get('type') # 'status-update', 'category-update', 'quality-update', or None
     original_status = template.status
     main_field_value = ''
     meta_fields_to_update = {}
-    
+
     logger.info(
-        "Processing event '%s' for template %s (Current Status: %s).", 
+        "Processing event '%s' for template %s (Current Status: %s).",
         event_type, template.provider_template_id or template.elementName, original_status
     )
 
-    # --- 2. Process Event Types ---
-    
     if event_type in ['status-update', None]:
         status_raw = payload.get('status', '').lower()
         description = payload.get('description')
-        
-        new_status = status_raw 
+
+        new_status = status_raw
 
         valid_statuses = [c[0] for c in WhatsAppTemplate.STATUS_CHOICES]
-        
+
         if new_status and new_status in valid_statuses:
             main_field_value = new_status
             meta_fields_to_update['status'] = new_status
             logger.info("Status change detected: %s -> %s", original_status, new_status)
-        
+
         # CRITICAL: Update the dedicated status_description field
         if description:
             meta_fields_to_update['status_description'] = description
@@ -75,14 +132,16 @@ def handle_gupshup_template_webhook(webhook_data: dict) -> bool:
             meta_fields_to_update['status_description'] = None # Clear if no new description
 
         if new_status == 'deleted':
-            template.mark_as_deleted()
-        
+            # Field-only mark; persisted with the rest of the batch rather
+            # than through mark_as_deleted(), which issues its own save().
+            template.isDeleted = 'Deleted'
+
     elif event_type == 'category-update':
         category_data = payload.get('category', {})
-        
+
         new_category = category_data.get('new')
         old_category = category_data.get('old')
-        
+
         if new_category:
             main_field_value = new_category
             meta_fields_to_update['category'] = new_category.upper()
@@ -90,13 +149,13 @@ def handle_gupshup_template_webhook(webhook_data: dict) -> bool:
 
         if old_category:
             meta_fields_to_update['oldCategory'] = old_category.upper()
-            
+
 
     elif event_type == 'quality-update':
         quality_raw = payload.get('quality')
         if quality_raw:
             main_field_value = quality_raw
-            meta_fields_to_update['quality'] = quality_raw 
+            meta_fields_to_update['quality'] = quality_raw
             logger.info("Quality update detected: %s", quality_raw)
 
     else:
@@ -105,20 +164,18 @@ def handle_gupshup_template_webhook(webhook_data: dict) -> bool:
             event_type, template.provider_template_id
         )
         return False
-        
-    # --- 3. Final Update and Logging ---
-    
-    try:
-        # Use the helper function to perform the combined update and meta logging
-        template._update_and_log_webhook_event(
-            event_type = event_type, 
-            main_field_value = main_field_value,
-            event_payload = meta_fields_to_update
-        )
 
-        logger.info("Template %s successfully processed event '%s'. Main fields and webhookMeta updated.", 
-                    template.provider_template_id or template.elementName, event_type)
-        return True
-    except Exception as e:
-        logger.exception("FATAL ERROR saving template %s after webhook: %s", template.provider_template_id, e)
-        return False
\ No newline at end of file
+    # Use the helper function to perform the combined update and meta
+    # logging; save=False because the batch is flushed with bulk_update.
+    template._update_and_log_webhook_event(
+        event_type = event_type,
+        main_field_value = main_field_value,
+        event_payload = meta_fields_to_update,
+        save = False
+    )
+    # bulk_update bypasses auto_now, so stamp updated_at explicitly.
+    template.updated_at = timezone.now()
+
+    logger.info("Template %s successfully processed event '%s'. Main fields and webhookMeta updated.",
+                template.provider_template_id or template.elementName, event_type)
+    return True
@@ -98,6 +98,31 @@ JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM', 'RS256')
 CELERY_BROKER_URL = REDIS_URL
 CELERY_RESULT_BACKEND = REDIS_URL
 
+# Route I/O-bound provider HTTP tasks and the heavier sync task to separate
+# queues so they can be served by pools matched to their shape, e.g.:
+#   celery -A whatsapp_template_service worker -Q provider_io -P gevent -c 200 \
+#       --prefetch-multiplier=64
+#   celery -A whatsapp_template_service worker -Q provider_sync,celery -c 4 \
+#       --prefetch-multiplier=1 --max-tasks-per-child=50
+# Long syncs want a multiplier of 1 so an idle worker can pick them up
+# instead of one busy worker hoarding four; short provider calls want a
+# large multiplier to amortize broker round trips. The default below suits
+# the sync/default worker and is overridden per worker on the command line.
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(os.environ.get('CELERY_WORKER_PREFETCH_MULTIPLIER', 1))
+CELERY_WORKER_MAX_TASKS_PER_CHILD = int(os.environ.get('CELERY_WORKER_MAX_TASKS_PER_CHILD', 50))
+
+# Results that are kept (task ids are polled via TaskStatusView) are small
+# status dicts, but the catalog read task can return whole sheets — compress
+# them and let Redis reclaim the keys after an hour.
+CELERY_RESULT_COMPRESSION = 'gzip'
+CELERY_RESULT_EXPIRES = 3600
+CELERY_TASK_ROUTES = {
+    'wa_templates.tasks.submit_template_for_approval': {'queue': 'provider_io'},
+    'wa_templates.tasks.update_template_with_provider': {'queue': 'provider_io'},
+    'wa_templates.tasks.delete_template_with_provider': {'queue': 'provider_io'},
+    'wa_templates.tasks.sync_templates_for_app_id': {'queue': 'provider_sync'},
+}
+
 # Logging
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'DEBUG')
 LOGGING = {
@@ -0,0 +1,14 @@
+from .settings import *  # noqa: F401,F403
+
+# Test runs use in-memory SQLite regardless of how the environment's
+# database is configured: the suite touches a handful of schema-light
+# models and nothing Postgres-specific, and an in-memory database removes
+# the create/destroy and per-query disk I/O entirely. Combine with
+# --keepdb to skip the schema pass on repeat runs against a file-backed
+# database.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}